@@ -0,0 +1,90 @@
+"""
+Per-unit availability over a date window.
+
+Every booking (not cancelled) and active tenancy touching the window is
+read for all requested units in one UNION query, reduced to day indexes
+and OR-ed into one integer bitmap per unit (bit i = day i is taken), so a
+whole interval is merged with a single shift-and-or however long it is.
+Bitmaps are returned as '0'/'1' strings or merged into intervals.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q, Value
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Booking, Tenancy
+
+
+class Availability:
+    def __init__(self, unit_ids, first, last):
+        self.unit_ids = list(unit_ids)
+        self.first = first
+        self.last = last
+        self.days = (last - first).days + 1
+
+    def get_queryset(self):
+        window_start = timezone.make_aware(datetime.combine(self.first, time.min))
+        window_end = timezone.make_aware(datetime.combine(self.last + timedelta(days=1), time.min))
+        bookings = Booking.objects.filter(
+            property_unit_id__in=self.unit_ids,
+            check_in__lt=window_end,
+            check_out__gt=window_start,
+        ).exclude(booking_status='cancelled').values_list(
+            'property_unit_id', TruncDate('check_in'), TruncDate('check_out'), Value('booking')
+        )
+        tenancies = Tenancy.objects.filter(
+            Q(tenancy_end_date__isnull=True) | Q(tenancy_end_date__gte=self.first),
+            property_unit_id__in=self.unit_ids,
+            active=True,
+            tenancy_start_date__lte=self.last,
+        ).values_list('property_unit_id', 'tenancy_start_date', 'tenancy_end_date', Value('tenancy'))
+        return bookings.order_by().union(tenancies.order_by(), all=True)
+
+    def day_range(self, start, end, kind):
+        """Half-open [start, end) day indexes in the window, or None if outside it."""
+        if kind == 'tenancy':
+            # Tenancy end dates are inclusive and may be open.
+            end = end + timedelta(days=1) if end else self.last + timedelta(days=1)
+        elif end <= start:
+            # A same-day stay still takes that day; the check-out day is otherwise free.
+            end = start + timedelta(days=1)
+        begin = max((start - self.first).days, 0)
+        stop = min((end - self.first).days, self.days)
+        return (begin, stop) if begin < stop else None
+
+    def bitmaps(self):
+        bitmaps = {str(unit_id): 0 for unit_id in self.unit_ids}
+        for unit_id, start, end, kind in self.get_queryset():
+            days = self.day_range(start, end, kind)
+            if days:
+                begin, stop = days
+                bitmaps[str(unit_id)] |= ((1 << (stop - begin)) - 1) << begin
+        return bitmaps
+
+    def as_bitmaps(self):
+        return {
+            unit_id: format(bitmap, f'0{self.days}b')[::-1]
+            for unit_id, bitmap in self.bitmaps().items()
+        }
+
+    def as_intervals(self):
+        """Merged runs of taken days, as inclusive [start, end] dates."""
+        result = {}
+        for unit_id, bitmap in self.bitmaps().items():
+            intervals = []
+            day = 0
+            while bitmap:
+                # Skip free days, then measure the run of taken ones.
+                skip = (bitmap & -bitmap).bit_length() - 1
+                bitmap >>= skip
+                day += skip
+                run = (~bitmap & (bitmap + 1)).bit_length() - 1
+                intervals.append([
+                    (self.first + timedelta(days=day)).isoformat(),
+                    (self.first + timedelta(days=day + run - 1)).isoformat(),
+                ])
+                bitmap >>= run
+                day += run
+            result[unit_id] = intervals
+        return result
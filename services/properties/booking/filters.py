@@ -0,0 +1,52 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.filters import QueryParamFilter
+from core.models import Booking
+
+
+class BookingFilter(QueryParamFilter):
+    """
+    Translates booking list query params (unit, project, guest, booking and
+    payment status, a from/to stay window, ordering) into queryset filters.
+    The window keeps bookings whose stay overlaps the inclusive date range.
+    """
+    default_ordering = ('-created_at', '-id')
+    ordering_fields = ('created_at', 'check_in', 'check_out')
+
+    def filter_queryset(self, queryset):
+        filters = {}
+
+        property_unit = self.get_uuid('property_unit')
+        if property_unit is not None:
+            filters['property_unit_id_id'] = property_unit
+        property_project = self.get_uuid('property_project')
+        if property_project is not None:
+            filters['property_unit_id__property_project_id'] = property_project
+        guest = self.get_uuid('guest')
+        if guest is not None:
+            filters['guest_id'] = guest
+        booking_status = self.get_choices('booking_status', Booking.BOOKING_STATUSES)
+        if booking_status:
+            filters['booking_status__in'] = booking_status
+        payment_status = self.get_choices('payment_status', Booking.PAYMENT_STATUSES)
+        if payment_status:
+            filters['payment_status__in'] = payment_status
+
+        first = self.get_date('from')
+        if first is not None:
+            filters['check_out__gt'] = timezone.make_aware(datetime.combine(first, time.min))
+        last = self.get_date('to')
+        if last is not None:
+            filters['check_in__lt'] = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+        if first and last and last < first:
+            self.errors['to'] = ['Must not be before "from".']
+
+        ordering = self.get_ordering()
+
+        if self.errors:
+            raise serializers.ValidationError(self.errors)
+
+        return queryset.filter(**filters).order_by(*ordering)
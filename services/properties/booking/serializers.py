@@ -1,12 +1,65 @@
 from rest_framework import serializers
+from core.constraints import constraint_errors
+from django.utils import timezone
 from core.models import Booking
+from core.pricing import quote_many
+
+
+OVERLAP_ERRORS = {
+    'booking_no_overlap': {
+        'check_in': ["This unit is already booked for part of these dates."]
+    },
+}
 
 
 class BookingSerializer(serializers.ModelSerializer):
-    guest_email = serializers.EmailField(source='guest_id.email', read_only=True)
+    guest_email = serializers.EmailField(source='guest.email', read_only=True)
     property_unit_name = serializers.CharField(source='property_unit_id.unit_name', read_only=True)
 
     class Meta:
         model = Booking
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'guest_email', 'property_unit_name']
+        read_only_fields = ['id', 'created_at', 'guest_email', 'property_unit_name', 'total_amount']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the unit and guest the serializer embeds with each booking."""
+        return queryset.select_related('property_unit_id', 'guest')
+
+    def validate(self, data):
+        check_in = data.get('check_in', getattr(self.instance, 'check_in', None))
+        check_out = data.get('check_out', getattr(self.instance, 'check_out', None))
+        if check_in and check_out and check_out <= check_in:
+            raise serializers.ValidationError({'check_out': ["Check-out must be after check-in."]})
+        unit = data.get('property_unit_id', getattr(self.instance, 'property_unit_id', None))
+        stay = (unit.pk, check_in, check_out)
+        if self.instance is None or stay != (self.instance.property_unit_id_id, self.instance.check_in, self.instance.check_out):
+            data['total_amount'] = self.price(unit, check_in, check_out)
+        return data
+
+    @staticmethod
+    def price(unit, check_in, check_out):
+        """Server-side total for the stay (core.pricing); rate changes never reprice existing bookings."""
+        first = timezone.localtime(check_in).date()
+        last = timezone.localtime(check_out).date()
+        return quote_many([unit.pk], first, last)[str(unit.pk)]['total']
+
+    # Overlaps are rejected by the booking_no_overlap exclusion constraint,
+    # which also holds for concurrent requests.
+
+    def create(self, validated_data):
+        with constraint_errors(OVERLAP_ERRORS):
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with constraint_errors(OVERLAP_ERRORS):
+            return super().update(instance, validated_data)
+
+
+class BookingQuoteSerializer(serializers.Serializer):
+    """A core.pricing quote, with money rendered like every other amount in the API."""
+    nights = serializers.IntegerField()
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2)
+    discount_percent = serializers.DecimalField(max_digits=5, decimal_places=2)
+    discount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import BookingListCreateAPIView, BookingDetailAPIView
+from .views import (
+    BookingListCreateAPIView,
+    BookingDetailAPIView,
+    BookingExportAPIView,
+    BookingAvailabilityAPIView,
+    BookingQuoteAPIView,
+)
 
 urlpatterns = [
     path('', BookingListCreateAPIView.as_view(), name='booking-list-create'),
+    path('availability/', BookingAvailabilityAPIView.as_view(), name='booking-availability'),
+    path('quote/', BookingQuoteAPIView.as_view(), name='booking-quote'),
+    path('export.<str:export_format>', BookingExportAPIView.as_view(), name='booking-export'),
     path('<uuid:pk>/', BookingDetailAPIView.as_view(), name='booking-detail'),
 ]
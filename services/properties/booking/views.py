@@ -3,17 +3,38 @@ from django.shortcuts import render
 # Create your views here.
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from rest_framework import status
-from core.models import Booking
-from .serializers import BookingSerializer
+from rest_framework.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+import uuid
+from core.models import Booking, PropertyUnit
+from .serializers import BookingQuoteSerializer, BookingSerializer
+from .filters import BookingFilter
+from core.conditional import conditional_get, object_validators
+from core.exports import export_response
+from core.pagination import StandardPagination
+from core.pricing import quote_many
+from .availability import Availability
+
+VALIDATOR_FIELDS = ('updated_at', 'property_unit_id__updated_at', 'guest__updated_at')
 
 class BookingListCreateAPIView(APIView):
-    """Handles GET (list all bookings) and POST (create new booking)"""
+    """Handles GET (list bookings, filtered and paginated) and POST (create new booking)"""
+
+    pagination_class = StandardPagination
+    etag_from_content = True
+
+    def get_queryset(self, request):
+        return BookingFilter(request.query_params).filter_queryset(Booking.objects.all())
 
+    @conditional_get
     def get(self, request):
-        bookings = Booking.objects.select_related('property_unit_id', 'guest_id').order_by('-created_at')
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        bookings = BookingSerializer.setup_eager_loading(self.get_queryset(request))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(bookings, request)
+        serializer = BookingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = BookingSerializer(data=request.data)
@@ -32,6 +53,10 @@ class BookingDetailAPIView(APIView):
         except Booking.DoesNotExist:
             return None
 
+    def get_validators(self, request, pk):
+        return object_validators(Booking.objects.all(), pk, *VALIDATOR_FIELDS)
+
+    @conditional_get
     def get(self, request, pk):
         booking = self.get_object(pk)
         if not booking:
@@ -55,3 +80,118 @@ class BookingDetailAPIView(APIView):
             return Response({'error': 'Booking not found.'}, status=status.HTTP_404_NOT_FOUND)
         booking.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BookingExportAPIView(APIView):
+    """Stream all bookings as CSV or NDJSON, in table order."""
+    permission_classes = [IsAdminUser]
+    fields = [
+        ('id', 'id'),
+        ('property_unit', 'property_unit_id'),
+        ('unit_name', 'property_unit_id__unit_name'),
+        ('guest', 'guest_id'),
+        ('guest_email', 'guest__email'),
+        ('check_in', 'check_in'),
+        ('check_out', 'check_out'),
+        ('total_amount', 'total_amount'),
+        ('payment_status', 'payment_status'),
+        ('booking_status', 'booking_status'),
+        ('created_at', 'created_at'),
+    ]
+
+    def get(self, request, export_format):
+        return export_response(Booking.objects.order_by(), self.fields, export_format, 'bookings')
+
+
+class UnitSetAPIView(APIView):
+    """
+    Base for read-only views over a set of units, given as `units` (comma
+    separated ids) or `property_project`, and a date range.
+    """
+    max_days = 366
+    max_units = 1000
+
+    def get_date(self, request, param):
+        value = request.query_params.get(param)
+        try:
+            parsed = parse_date(value) if value else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({param: ['Enter a valid date (YYYY-MM-DD).']})
+        return parsed
+
+    def get_unit_ids(self, request):
+        units = request.query_params.get('units')
+        project = request.query_params.get('property_project')
+        try:
+            if units:
+                unit_ids = list(dict.fromkeys(uuid.UUID(value.strip()) for value in units.split(',') if value.strip()))
+            elif project:
+                unit_ids = list(
+                    PropertyUnit.objects.filter(property_project_id=uuid.UUID(project))
+                    .order_by('unit_name', 'id').values_list('id', flat=True)
+                )
+            else:
+                raise ValidationError({'units': ['Pass units or property_project.']})
+        except ValueError:
+            raise ValidationError({'units' if units else 'property_project': ['A valid UUID is required.']})
+        if len(unit_ids) > self.max_units:
+            raise ValidationError({'units': [f'At most {self.max_units} units per request.']})
+        return unit_ids
+
+
+class BookingAvailabilityAPIView(UnitSetAPIView):
+    """
+    Which days of a window each unit is taken by a booking or an active
+    tenancy. Query params: `from` and `to` (YYYY-MM-DD, inclusive), either
+    `units` (comma separated ids) or `property_project`, and `layout`:
+    `bitmap` (default; one '0'/'1' character per day, '1' = taken) or
+    `intervals` (inclusive [start, end] runs of taken days).
+    """
+    layouts = ('bitmap', 'intervals')
+
+    def get(self, request):
+        first = self.get_date(request, 'from')
+        last = self.get_date(request, 'to')
+        if last < first:
+            raise ValidationError({'to': ['Must not be before "from".']})
+        if (last - first).days >= self.max_days:
+            raise ValidationError({'to': [f'The window can span at most {self.max_days} days.']})
+        layout = request.query_params.get('layout', 'bitmap')
+        if layout not in self.layouts:
+            raise ValidationError({'layout': [f"Must be one of: {', '.join(self.layouts)}."]})
+
+        availability = Availability(self.get_unit_ids(request), first, last)
+        units = availability.as_bitmaps() if layout == 'bitmap' else availability.as_intervals()
+        return Response({
+            'from': first,
+            'to': last,
+            'days': availability.days,
+            'layout': layout,
+            'units': units,
+        })
+
+
+class BookingQuoteAPIView(UnitSetAPIView):
+    """
+    Server-side price of a stay for many units at once (core.pricing), e.g.
+    for search results. Query params: `check_in` and `check_out`
+    (YYYY-MM-DD) and either `units` (comma separated ids) or
+    `property_project`. Unknown units are left out.
+    """
+
+    def get(self, request):
+        check_in = self.get_date(request, 'check_in')
+        check_out = self.get_date(request, 'check_out')
+        if check_out < check_in:
+            raise ValidationError({'check_out': ['Must not be before check-in.']})
+        if (check_out - check_in).days > self.max_days:
+            raise ValidationError({'check_out': [f'A stay can last at most {self.max_days} nights.']})
+
+        quotes = quote_many(self.get_unit_ids(request), check_in, check_out)
+        return Response({
+            'check_in': check_in,
+            'check_out': check_out,
+            'units': {unit_id: BookingQuoteSerializer(quote).data for unit_id, quote in quotes.items()},
+        })
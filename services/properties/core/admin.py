@@ -56,4 +56,6 @@ admin.site.register(models.TenantProfile)
 admin.site.register(models.Role)
 admin.site.register(models.Tenancy)
 admin.site.register(models.Booking)
-admin.site.register(models.PropertyUnitImage)
\ No newline at end of file
+admin.site.register(models.PropertyUnitImage)
+admin.site.register(models.RateRule)
+admin.site.register(models.StayDiscount)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+JWT authentication that trusts the access token's claims on reads.
+
+Tokens are issued with the user's role names, property project and staff
+flag as claims (ClaimsRefreshToken). On safe (read-only) requests
+ClaimsJWTAuthentication builds a ClaimsTokenUser from those claims instead
+of loading the user row; writes, views that set `requires_user_model =
+True` and tokens issued without the claims still get the real User,
+loaded through core.user_cache.
+
+Claims are a snapshot taken at login, so the token also carries the user's
+core.user_cache version. It is bumped whenever the user row or roles change
+(deactivation included), and a token whose version is no longer current
+falls back to the real User - whose is_active is checked - at the cost of
+one cache read per request.
+"""
+from functools import cached_property
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.user_cache import get_version, load_user
+
+
+ROLES_CLAIM = 'roles'
+PROPERTY_PROJECT_CLAIM = 'property_project'
+IS_STAFF_CLAIM = 'is_staff'
+USER_VERSION_CLAIM = 'user_version'
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        # Copied into the access token by RefreshToken.access_token.
+        token[ROLES_CLAIM] = sorted(user.roles.values_list('name', flat=True))
+        token[PROPERTY_PROJECT_CLAIM] = str(user.property_project_id) if user.property_project_id else None
+        token[IS_STAFF_CLAIM] = user.is_staff
+        token[USER_VERSION_CLAIM] = get_version(user.pk)
+        return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """Stateless user backed by the claims of a ClaimsRefreshToken access token."""
+
+    @cached_property
+    def role_names(self):
+        return tuple(self.token.get(ROLES_CLAIM, ()))
+
+    @cached_property
+    def property_project_id(self):
+        return self.token.get(PROPERTY_PROJECT_CLAIM)
+
+    def has_role(self, name):
+        return name in self.role_names
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        self.stateless = self.can_use_claims(request)
+        return super().authenticate(request)
+
+    def can_use_claims(self, request):
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        return request.method in SAFE_METHODS and not getattr(view, 'requires_user_model', False)
+
+    def get_user(self, validated_token):
+        if self.stateless and self.claims_are_current(validated_token):
+            return ClaimsTokenUser(validated_token)
+        return self.get_model_user(validated_token)
+
+    def claims_are_current(self, validated_token):
+        """Whether the user is unchanged (still active, same roles) since the token was issued."""
+        if ROLES_CLAIM not in validated_token or api_settings.USER_ID_CLAIM not in validated_token:
+            return False
+        version = validated_token.get(USER_VERSION_CLAIM)
+        return version is not None and version == get_version(validated_token[api_settings.USER_ID_CLAIM])
+
+    def get_model_user(self, validated_token):
+        """JWTAuthentication.get_user, with the row read through core.user_cache."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = load_user(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,34 @@
+"""
+Reporting of database constraint violations as validation errors.
+
+Some invariants (e.g. non-overlapping tenancies) are enforced by
+PostgreSQL constraints rather than by checks in Python, which could race
+with concurrent writes. Serializers run their writes inside
+constraint_errors() so a violation becomes a regular 400 response.
+"""
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+
+def violated_constraint(error):
+    """Name of the constraint an IntegrityError violated, when the driver reports it."""
+    diag = getattr(error.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None)
+
+
+@contextmanager
+def constraint_errors(messages):
+    """
+    Run the block in a savepoint and raise ValidationError(messages[name])
+    if it violates one of the named constraints.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        name = violated_constraint(error)
+        if name not in messages:
+            raise
+        raise serializers.ValidationError(messages[name])
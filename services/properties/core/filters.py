@@ -0,0 +1,101 @@
+import json
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.utils.dateparse import parse_date
+
+
+class QueryParamFilter:
+    """
+    Base for list filters: parses query params, collecting errors per param
+    in self.errors (lists of messages, like serializer errors) so a
+    subclass's filter_queryset can raise them all at once.
+    """
+    default_ordering = ('id',)
+    ordering_fields = ()
+    boolean_values = {'true': True, '1': True, 'false': False, '0': False}
+
+    def __init__(self, query_params):
+        self.query_params = query_params
+        self.errors = {}
+
+    def get_ordering(self):
+        value = self.query_params.get('ordering')
+        if not value:
+            return self.default_ordering
+        if value.lstrip('-') not in self.ordering_fields:
+            self.errors['ordering'] = [f"Ordering must be one of: {', '.join(self.ordering_fields)}."]
+            return self.default_ordering
+        tie_breaker = '-id' if value.startswith('-') else 'id'
+        return (value, tie_breaker)
+
+    def get_list(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return []
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    def get_choices(self, name, choices):
+        values = self.get_list(name)
+        allowed = {key for key, _ in choices}
+        invalid = [value for value in values if value not in allowed]
+        if invalid:
+            self.errors[name] = [f"Invalid choice(s): {', '.join(invalid)}."]
+        return values
+
+    def get_decimal(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return None
+        try:
+            number = Decimal(value)
+        except InvalidOperation:
+            number = None
+        if number is None or not number.is_finite():
+            self.errors[name] = ["A valid number is required."]
+            return None
+        return number
+
+    def get_uuid(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            self.errors[name] = ["A valid UUID is required."]
+            return None
+
+    def get_date(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            self.errors[name] = ["Enter a valid date (YYYY-MM-DD)."]
+        return parsed
+
+    def get_boolean(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return None
+        if value.lower() not in self.boolean_values:
+            self.errors[name] = ["Must be true or false."]
+            return None
+        return self.boolean_values[value.lower()]
+
+    def get_json_object(self, name):
+        value = self.query_params.get(name)
+        if not value:
+            return None
+        try:
+            data = json.loads(value)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            self.errors[name] = ["Must be a JSON object."]
+            return None
+        return data
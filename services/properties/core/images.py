@@ -0,0 +1,239 @@
+"""
+Resized derivatives of uploaded photos.
+
+Project cover photos and unit gallery images are rendered into thumbnail,
+card and full sizes, each as JPEG and WebP, by a pool of worker processes so
+uploads return as soon as the original is stored. The worker records the
+stored variant names on the row (with a queryset update, so no signals
+fire) and serializers turn them into URLs; the web process then touches the
+embedding resource and bumps its cached responses.
+
+Variant names derive from the original's name, so a re-render overwrites
+them. Variants of a replaced or cleared image are deleted once the new ones
+are recorded, and those of a deleted row on commit (see core.signals).
+"""
+import io
+import logging
+import multiprocessing
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from core.response_cache import bump_project_versions
+
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = {
+    'thumbnail': (320, 240),
+    'card': (800, 600),
+    'full': (1920, 1440),
+}
+
+FORMATS = {
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+}
+
+# model label -> (image field, variants field)
+IMAGE_FIELDS = {
+    'core.PropertyProject': ('cover_photo', 'cover_photo_variants'),
+    'core.PropertyUnitImage': ('image', 'variants'),
+}
+
+_executor = None
+
+
+def variant_name(name, variant, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', f'{stem}_{variant}.{extension}')
+
+
+def render_variants(name, storage=default_storage):
+    """Render every size and format of the stored image `name` and return their storage names."""
+    with storage.open(name, 'rb') as source:
+        original = Image.open(source)
+        # Let the JPEG decoder downscale while decoding; no variant is larger than 'full'.
+        original.draft('RGB', VARIANT_SIZES['full'])
+        original.load()
+        original = ImageOps.exif_transpose(original)
+        if original.mode in ('RGBA', 'LA', 'P'):
+            original = original.convert('RGBA')
+            background = Image.new('RGB', original.size, (255, 255, 255))
+            background.paste(original, mask=original.getchannel('A'))
+            original = background
+        elif original.mode != 'RGB':
+            original = original.convert('RGB')
+
+    variants = {'source': name}
+    for variant, size in VARIANT_SIZES.items():
+        resized = original.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+        variants[variant] = {}
+        for extension, options in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, **options)
+            target = variant_name(name, variant, extension)
+            # Overwrite a previous render instead of letting storage pick a new name.
+            storage.delete(target)
+            variants[variant][extension] = storage.save(target, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def variant_files(variants):
+    """Storage names of every file recorded in a variants dict."""
+    return {
+        name
+        for variant in VARIANT_SIZES
+        for name in ((variants or {}).get(variant) or {}).values()
+    }
+
+
+def delete_files(names, storage=default_storage):
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.exception('Could not delete image variant %s', name)
+
+
+def render_image(model_label, pk):
+    """Worker entry point: render the variants of one row and record them."""
+    from django.apps import apps
+
+    model = apps.get_model(model_label)
+    image_field, variants_field = IMAGE_FIELDS[model_label]
+    name, previous = model.objects.filter(pk=pk).values_list(image_field, variants_field).first() or (None, None)
+    if not name:
+        return None
+    try:
+        variants = render_variants(name)
+    except (OSError, Image.DecompressionBombError):
+        logger.exception('Could not render variants of %s', name)
+        return None
+    # Only record them if the image was not replaced (or the row deleted) while we were working.
+    if not model.objects.filter(pk=pk, **{image_field: name}).update(**{variants_field: variants}):
+        delete_files(variant_files(variants))
+        return None
+    delete_files(variant_files(previous) - variant_files(variants))
+    return variants
+
+
+def touch_image_owner(model_label, pk):
+    """
+    Bump the timestamp and cached responses of the resource embedding the
+    variant URLs. Runs in the web process, never in a worker: with a
+    process-local cache a worker's version bump would not be seen.
+    """
+    from django.apps import apps
+
+    if model_label == 'core.PropertyUnitImage':
+        units = apps.get_model('core.PropertyUnit').objects.filter(gallery__pk=pk)
+        project_ids = list(units.values_list('property_project_id', flat=True))
+        units.update(updated_at=timezone.now())
+    else:
+        apps.get_model(model_label).objects.filter(pk=pk).update(updated_at=timezone.now())
+        project_ids = [pk]
+    bump_project_versions(*project_ids)
+
+
+def process_image(model_label, pk):
+    """Render and record the variants of one row in this process."""
+    variants = render_image(model_label, pk)
+    if variants:
+        touch_image_owner(model_label, pk)
+    return variants
+
+
+def needs_variants(instance):
+    image_field, variants_field = IMAGE_FIELDS[instance._meta.label]
+    name = getattr(instance, image_field).name
+    return bool(name) and (getattr(instance, variants_field) or {}).get('source') != name
+
+
+def discard_variants(instance):
+    """
+    Delete the variant files recorded for `instance` once the current
+    transaction commits, and return their names; for a row whose image was
+    cleared, or that is being deleted. They are read from the row, where the
+    worker records them.
+    """
+    image_field, variants_field = IMAGE_FIELDS[instance._meta.label]
+    variants = type(instance).objects.filter(pk=instance.pk).values_list(variants_field, flat=True).first()
+    names = variant_files(variants)
+    if names:
+        transaction.on_commit(lambda: delete_files(names))
+    return names
+
+
+def variant_urls(image, variants, storage=default_storage):
+    """
+    URLs of each size/format of `image`, falling back to the original while
+    the variants are still being rendered (or the image was replaced).
+    """
+    if not image:
+        return None
+    if not variants or variants.get('source') != image.name:
+        original = image.url
+        return {variant: {extension: original for extension in FORMATS} for variant in VARIANT_SIZES}
+    return {
+        variant: {extension: storage.url(variants[variant][extension]) for extension in FORMATS}
+        for variant in VARIANT_SIZES
+    }
+
+
+def _setup_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'properties.settings')
+    import django
+    django.setup()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_setup_worker,
+        )
+    return _executor
+
+
+def _rendered(model_label, pk):
+    """Done-callback of a worker's render_image, run in this process."""
+    def callback(future):
+        if future.exception() is not None:
+            logger.error('Image variant worker failed', exc_info=future.exception())
+            return
+        if not future.result():
+            return
+        try:
+            touch_image_owner(model_label, pk)
+        except Exception:
+            logger.exception('Could not refresh the owner of rendered image %s %s', model_label, pk)
+        finally:
+            # Callbacks run on the executor's management thread; don't keep its connection open.
+            connections.close_all()
+    return callback
+
+
+def schedule_variants(instance):
+    """Render variants for `instance` after the current transaction commits."""
+    model_label = instance._meta.label
+    pk = instance.pk
+
+    def submit():
+        if not settings.IMAGE_VARIANT_WORKERS:
+            process_image(model_label, pk)
+            return
+        get_executor().submit(render_image, model_label, pk).add_done_callback(_rendered(model_label, pk))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,111 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import QueryDict
+
+from core.models import PropertyProject, PropertyUnit
+from property_project.filters import PropertyUnitFilter
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the unit list filters and check that their query plans use indexes'
+
+    amenity_keys = ['pool', 'parking', 'gym', 'balcony', 'elevator', 'security', 'garden', 'wifi']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--units', type=int, default=100000, help='Synthetic units to seed (0 to use existing data)')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows instead of rolling back')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Query plans can only be checked on PostgreSQL.')
+        self.verbosity = options['verbosity']
+
+        try:
+            with transaction.atomic():
+                project = self.seed(options['units'])
+                self.run(project, options['page_size'])
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.WARNING('Seeded rows rolled back.'))
+
+    def seed(self, count):
+        if not count:
+            project = PropertyProject.objects.order_by('name', 'id').first()
+            if project is None:
+                raise CommandError('No property projects to benchmark against.')
+            return project
+
+        projects = [
+            PropertyProject.objects.create(name=f'Benchmark project {i}', address='Benchmark')
+            for i in range(max(1, count // 1000))
+        ]
+        unit_types = [key for key, _ in PropertyUnit.UNIT_TYPES]
+        purposes = [key for key, _ in PropertyUnit.PURPOSE_CHOICES]
+        rng = random.Random(42)
+
+        start = time.perf_counter()
+        batch = []
+        for i in range(count):
+            batch.append(PropertyUnit(
+                property_project=projects[i % len(projects)],
+                unit_name=f'B{i:07d}',
+                unit_type=rng.choice(unit_types),
+                purpose=rng.choice(purposes),
+                price=Decimal(rng.randrange(100, 1000000)) / 100,
+                is_listed_for_rent=rng.random() < 0.2,
+                is_listed_for_sale=rng.random() < 0.05,
+                amenities={key: True for key in rng.sample(self.amenity_keys, rng.randint(0, 3))},
+            ))
+            if len(batch) == 5000:
+                PropertyUnit.objects.bulk_create(batch)
+                batch = []
+        PropertyUnit.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE property_units')
+        self.stdout.write(f'Seeded {count} units in {time.perf_counter() - start:.1f}s')
+        return projects[0]
+
+    def get_scenarios(self, project):
+        return {
+            'price range': 'price_min=2000&price_max=2100&ordering=price',
+            'unit type + price': 'unit_type=villa&price_max=500&ordering=price',
+            'purpose + price': 'purpose=office&price_min=9900&ordering=-price',
+            'project + price': f'property_project={project.pk}&ordering=price',
+            'listed for rent': 'is_listed_for_rent=true&ordering=price',
+            'listed for sale': 'is_listed_for_sale=true&price_min=5000&ordering=price',
+            'amenity keys': 'amenities=pool,gym,garden',
+            'amenities contains': 'amenities_contains={"elevator": true, "wifi": true}&ordering=price',
+        }
+
+    def run(self, project, page_size):
+        failures = 0
+        for label, query in self.get_scenarios(project).items():
+            units = PropertyUnitFilter(QueryDict(query)).filter_queryset(PropertyUnit.objects.all())
+            page = units[:page_size]
+
+            plan = page.explain(analyze=True)
+            start = time.perf_counter()
+            list(page)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            # Other relations (e.g. a joined property_projects) may use indexes while units are scanned.
+            uses_index = f'Seq Scan on {PropertyUnit._meta.db_table}' not in plan
+            failures += not uses_index
+            style = self.style.SUCCESS if uses_index else self.style.ERROR
+            self.stdout.write(style(f'{label:<20} {elapsed:8.2f} ms  {"index" if uses_index else "SEQ SCAN"}  ?{query}'))
+            if self.verbosity > 1 or not uses_index:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f'{failures} filter(s) fell back to a sequential scan.')
+        self.stdout.write(self.style.SUCCESS('All filters are served by indexes.'))
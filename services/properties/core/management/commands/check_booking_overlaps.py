@@ -0,0 +1,83 @@
+import threading
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from booking.views import BookingListCreateAPIView
+from core.models import PropertyProject, PropertyUnit, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Send parallel overlapping booking requests for one unit and check that exactly one '
+        'succeeds (booking_no_overlap exclusion constraint, PostgreSQL only)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=8, help='Parallel overlapping requests to send')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The booking_no_overlap constraint only exists on PostgreSQL.')
+        count = options['requests']
+        if count < 2:
+            raise CommandError('Send at least 2 requests.')
+
+        # Rows must be committed so that every request thread, each on its own connection, sees them.
+        suffix = uuid.uuid4().hex[:12]
+        project = PropertyProject.objects.create(name=f'Overlap check {suffix}', address='Overlap check')
+        try:
+            unit = PropertyUnit.objects.create(
+                property_project=project, unit_name='O1', unit_type='apartment', purpose='residential', price=100
+            )
+            guest = User.objects.create_user(email=f'overlap-{suffix}@example.com', national_id=f'OVERLAP{suffix}')
+            try:
+                statuses = self.send(unit, guest, count)
+            finally:
+                guest.delete()
+        finally:
+            project.delete()
+
+        self.stdout.write(f'Responses: {dict(sorted(statuses.items()))}')
+        rejected = sum(statuses[code] for code in (400, 409))
+        if statuses[201] != 1 or rejected != count - 1:
+            raise CommandError(f'Expected one 201 and {count - 1} rejections.')
+        self.stdout.write(self.style.SUCCESS(f'Exactly one of {count} overlapping bookings was accepted.'))
+
+    def send(self, unit, guest, count):
+        check_in = timezone.now().replace(microsecond=0) + timedelta(days=30)
+        factory = APIRequestFactory()
+        view = BookingListCreateAPIView.as_view()
+        start = threading.Barrier(count)
+        statuses = Counter()
+        lock = threading.Lock()
+
+        def book(offset):
+            # Each request overlaps every other one by at least a day.
+            body = {
+                'property_unit_id': str(unit.pk),
+                'guest': str(guest.pk),
+                'check_in': (check_in + timedelta(hours=offset)).isoformat(),
+                'check_out': (check_in + timedelta(days=2)).isoformat(),
+            }
+            request = factory.post('/api/v1/bookings/', body, format='json')
+            force_authenticate(request, user=guest)
+            try:
+                start.wait()
+                response = view(request)
+                with lock:
+                    statuses[response.status_code] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(offset,)) for offset in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from user.imports import TenantImporter, TenantImportError
+
+
+class Command(BaseCommand):
+    help = 'Bulk register tenant users from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file of tenants')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        try:
+            with open(path, 'rb') as file:
+                importer = TenantImporter.from_file(file, file_format)
+            users = importer.run()
+        except OSError as error:
+            raise CommandError(f'Could not read "{path}": {error}')
+        except TenantImportError as error:
+            raise CommandError(str(error))
+
+        if users is None:
+            for error in importer.errors:
+                self.stderr.write(f'Row {error["row"]}: {error["errors"]}')
+            raise CommandError(f'{len(importer.errors)} invalid row(s), nothing was imported.')
+
+        self.stdout.write(self.style.SUCCESS(f'{len(users)} tenant(s) imported.'))
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from property_project.imports import UnitImporter, UnitImportError
+
+
+class Command(BaseCommand):
+    help = 'Bulk import property units from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file of units')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        try:
+            with open(path, 'rb') as file:
+                importer = UnitImporter.from_file(file, file_format)
+        except OSError as error:
+            raise CommandError(f'Could not read "{path}": {error}')
+        except UnitImportError as error:
+            raise CommandError(str(error))
+
+        units = importer.run()
+        if units is None:
+            for error in importer.errors:
+                self.stderr.write(f'Row {error["row"]}: {error["errors"]}')
+            raise CommandError(f'{len(importer.errors)} invalid row(s), nothing was imported.')
+
+        self.stdout.write(self.style.SUCCESS(f'{len(units)} unit(s) imported.'))
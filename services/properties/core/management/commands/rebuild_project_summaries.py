@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.models import PropertyProject
+from core.rollups import rebuild_all, rebuild_project
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly occupancy and revenue summaries of property projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', help='Only rebuild the project with this id')
+
+    def handle(self, *args, **options):
+        if options['project']:
+            if not PropertyProject.objects.filter(pk=options['project']).exists():
+                raise CommandError(f'Property project "{options["project"]}" does not exist.')
+            results = [(options['project'], rebuild_project(options['project']))]
+        else:
+            results = rebuild_all()
+
+        total = 0
+        for project_id, summaries in results:
+            total += len(summaries)
+            self.stdout.write(f'Project {project_id}: {len(summaries)} month(s) rebuilt.')
+
+        self.stdout.write(self.style.SUCCESS(f'Project summaries rebuilt ({total} rows).'))
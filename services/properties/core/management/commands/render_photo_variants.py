@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.images import IMAGE_FIELDS, needs_variants, process_image
+from django.apps import apps
+
+
+class Command(BaseCommand):
+    help = 'Render missing thumbnail, card and full variants of cover photos and unit gallery images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-render variants that already exist')
+
+    def handle(self, *args, **options):
+        for model_label, (image_field, _) in IMAGE_FIELDS.items():
+            model = apps.get_model(model_label)
+            rendered = 0
+            queryset = model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True})
+            for instance in queryset.iterator():
+                if options['force'] or needs_variants(instance):
+                    if process_image(model_label, instance.pk):
+                        rendered += 1
+            self.stdout.write(self.style.SUCCESS(f'{model_label}: rendered variants for {rendered} image(s).'))
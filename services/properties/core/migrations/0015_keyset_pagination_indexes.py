@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_alter_tenancy_deposit_amount_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='propertyproject',
+            index=models.Index(fields=['name', 'id'], name='project_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(fields=['property_project', 'unit_name', 'id'], name='unit_project_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+from core.operations import RunPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(fields=['price', 'id'], name='unit_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(fields=['property_project', 'price', 'id'], name='unit_project_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(fields=['unit_type', 'price', 'id'], name='unit_type_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(fields=['purpose', 'price', 'id'], name='unit_purpose_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(condition=models.Q(('is_listed_for_rent', True)), fields=['price', 'id'], name='unit_rent_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyunit',
+            index=models.Index(condition=models.Q(('is_listed_for_sale', True)), fields=['price', 'id'], name='unit_sale_price_id_idx'),
+        ),
+        RunPostgreSQL(
+            sql='CREATE INDEX unit_amenities_gin_idx ON property_units USING gin (amenities);',
+            reverse_sql='DROP INDEX IF EXISTS unit_amenities_gin_idx;',
+        ),
+    ]
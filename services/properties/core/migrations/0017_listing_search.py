@@ -0,0 +1,100 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:30
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from core.operations import RunPostgreSQL
+
+
+PROJECT_SEARCH_TRIGGER = """
+CREATE FUNCTION property_projects_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.address, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER property_projects_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON property_projects
+    FOR EACH ROW EXECUTE FUNCTION property_projects_search_vector_update();
+
+UPDATE property_projects SET name = name;
+"""
+
+UNIT_SEARCH_TRIGGER = """
+CREATE FUNCTION property_units_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.unit_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.unit_type, '') || ' ' || coalesce(NEW.purpose, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER property_units_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON property_units
+    FOR EACH ROW EXECUTE FUNCTION property_units_search_vector_update();
+
+UPDATE property_units SET unit_name = unit_name;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_unit_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyproject',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertyunit',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        TrigramExtension(),
+        RunPostgreSQL(
+            sql=PROJECT_SEARCH_TRIGGER,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS property_projects_search_vector_trigger ON property_projects;
+                DROP FUNCTION IF EXISTS property_projects_search_vector_update();
+            """,
+        ),
+        RunPostgreSQL(
+            sql=UNIT_SEARCH_TRIGGER,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS property_units_search_vector_trigger ON property_units;
+                DROP FUNCTION IF EXISTS property_units_search_vector_update();
+            """,
+        ),
+        RunPostgreSQL(
+            sql="""
+                CREATE INDEX project_search_vector_idx ON property_projects USING gin (search_vector);
+                CREATE INDEX unit_search_vector_idx ON property_units USING gin (search_vector);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS project_search_vector_idx;
+                DROP INDEX IF EXISTS unit_search_vector_idx;
+            """,
+        ),
+        RunPostgreSQL(
+            sql="""
+                CREATE INDEX project_name_trgm_idx ON property_projects USING gin (name gin_trgm_ops);
+                CREATE INDEX project_address_trgm_idx ON property_projects USING gin (address gin_trgm_ops);
+                CREATE INDEX unit_name_trgm_idx ON property_units USING gin (unit_name gin_trgm_ops);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS project_name_trgm_idx;
+                DROP INDEX IF EXISTS project_address_trgm_idx;
+                DROP INDEX IF EXISTS unit_name_trgm_idx;
+            """,
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_listing_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the summarised month')),
+                ('unit_count', models.PositiveIntegerField(default=0)),
+                ('occupied_units', models.PositiveIntegerField(default=0)),
+                ('active_tenancies', models.PositiveIntegerField(default=0)),
+                ('expected_rent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('collected_rent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'project_monthly_summaries',
+            },
+        ),
+        migrations.AddField(
+            model_name='projectmonthlysummary',
+            name='property_project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='core.propertyproject'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectmonthlysummary',
+            constraint=models.UniqueConstraint(fields=('property_project', 'month'), name='unique_summary_per_project_month'),
+        ),
+    ]
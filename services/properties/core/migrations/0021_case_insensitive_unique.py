@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='propertyproject',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='unique_project_name_lower'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='unique_email_lower'),
+        ),
+    ]
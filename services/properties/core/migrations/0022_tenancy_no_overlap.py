@@ -0,0 +1,49 @@
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import IntegrityError, migrations
+
+from core.operations import RunPostgreSQL
+
+
+def check_overlaps(apps, schema_editor):
+    """Refuse to add the constraint while active tenancies of a unit overlap, naming them."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.id, b.id, a.property_unit_id FROM tenancies a
+            JOIN tenancies b ON a.property_unit_id = b.property_unit_id AND a.id < b.id
+            WHERE a.active AND b.active
+              AND daterange(a.tenancy_start_date, a.tenancy_end_date, '[]')
+                  && daterange(b.tenancy_start_date, b.tenancy_end_date, '[]')
+            ORDER BY a.property_unit_id, a.id, b.id
+        """)
+        overlaps = cursor.fetchall()
+    if overlaps:
+        pairs = '\n'.join(f'  unit {unit}: tenancies {first} and {second}' for first, second, unit in overlaps)
+        raise IntegrityError(
+            f'Cannot add tenancy_no_overlap: {len(overlaps)} pair(s) of active tenancies overlap. '
+            f'End or deactivate one of each pair and migrate again.\n{pairs}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_case_insensitive_unique'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(check_overlaps, migrations.RunPython.noop),
+        # Active tenancies of a unit may not share a day; an open end date
+        # runs indefinitely. check_overlaps lists existing rows that overlap.
+        RunPostgreSQL(
+            sql="""
+                ALTER TABLE tenancies ADD CONSTRAINT tenancy_no_overlap EXCLUDE USING gist (
+                    property_unit_id WITH =,
+                    daterange(tenancy_start_date, tenancy_end_date, '[]') WITH &&
+                ) WHERE (active);
+            """,
+            reverse_sql='ALTER TABLE tenancies DROP CONSTRAINT IF EXISTS tenancy_no_overlap;',
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import IntegrityError, migrations
+
+from core.operations import RunPostgreSQL
+
+
+def check_overlaps(apps, schema_editor):
+    """Refuse to add the constraint while live bookings of a unit overlap, naming them."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.id, b.id, a.property_unit_id_id FROM bookings a
+            JOIN bookings b ON a.property_unit_id_id = b.property_unit_id_id AND a.id < b.id
+            WHERE a.booking_status <> 'cancelled' AND b.booking_status <> 'cancelled'
+              AND tstzrange(a.check_in, a.check_out, '[)') && tstzrange(b.check_in, b.check_out, '[)')
+            ORDER BY a.property_unit_id_id, a.id, b.id
+        """)
+        overlaps = cursor.fetchall()
+    if overlaps:
+        pairs = '\n'.join(f'  unit {unit}: bookings {first} and {second}' for first, second, unit in overlaps)
+        raise IntegrityError(
+            f'Cannot add booking_no_overlap: {len(overlaps)} pair(s) of bookings overlap. '
+            f'Cancel or move one of each pair and migrate again.\n{pairs}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_tenancy_no_overlap'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_overlaps, migrations.RunPython.noop),
+        # Bookings of a unit that are not cancelled may not overlap; stays are
+        # half-open, so a check-out and the next check-in can coincide.
+        # Uses btree_gist (migration 0022). check_overlaps lists existing rows
+        # that overlap.
+        RunPostgreSQL(
+            sql="""
+                ALTER TABLE bookings ADD CONSTRAINT booking_no_overlap EXCLUDE USING gist (
+                    property_unit_id_id WITH =,
+                    tstzrange(check_in, check_out, '[)') WITH &&
+                ) WHERE (booking_status <> 'cancelled');
+            """,
+            reverse_sql='ALTER TABLE bookings DROP CONSTRAINT IF EXISTS booking_no_overlap;',
+        ),
+    ]
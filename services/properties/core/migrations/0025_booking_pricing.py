@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_booking_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateRule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('start_date', models.DateField(blank=True, help_text='First night covered; open when empty', null=True)),
+                ('end_date', models.DateField(blank=True, help_text='Last night covered; open when empty', null=True)),
+                ('weekdays', models.JSONField(blank=True, help_text='ISO weekdays covered (1 = Monday ... 7 = Sunday); every day when empty', null=True)),
+                ('nightly_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('priority', models.IntegerField(default=0, help_text='The highest priority rule matching a night wins')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'rate_rules',
+            },
+        ),
+        migrations.CreateModel(
+            name='StayDiscount',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('min_nights', models.PositiveIntegerField()),
+                ('percent', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'stay_discounts',
+            },
+        ),
+        migrations.AddField(
+            model_name='raterule',
+            name='property_unit',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_rules', to='core.propertyunit'),
+        ),
+        migrations.AddField(
+            model_name='staydiscount',
+            name='property_unit',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stay_discounts', to='core.propertyunit'),
+        ),
+        migrations.AddConstraint(
+            model_name='staydiscount',
+            constraint=models.UniqueConstraint(fields=('property_unit', 'min_nights'), name='unique_stay_discount_per_unit_nights'),
+        ),
+        migrations.AddConstraint(
+            model_name='staydiscount',
+            constraint=models.CheckConstraint(condition=models.Q(('percent__gte', 0), ('percent__lte', 100)), name='stay_discount_percent_range'),
+        ),
+    ]
@@ -3,6 +3,8 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Lower
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -17,9 +19,22 @@ class PropertyProject(models.Model):
     address = models.TextField()    
     description = models.TextField(blank=True, null=True)
     cover_photo = models.ImageField(upload_to='property_projects/covers/', null=True, blank=True)
+    # Resized copies of cover_photo, written by core.images.
+    cover_photo_variants = models.JSONField(default=dict, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL, see migration 0017.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = 'property_projects'
+        indexes = [
+            models.Index(fields=['name', 'id'], name='project_name_id_idx'),
+            # GIN search and trigram indexes live in migration 0017 (PostgreSQL only).
+        ]
+        constraints = [
+            # Serves case-insensitive name lookups (PropertyProjectSerializer.validate_name).
+            models.UniqueConstraint(Lower('name'), name='unique_project_name_lower'),
+        ]
 
     def __str__(self):
         return self.name
@@ -51,6 +66,13 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def filter_email(self, email):
+        """Users whose email matches case-insensitively, served by the unique index on LOWER(email)."""
+        return self.annotate(email_lower=Lower('email')).filter(email_lower=email.lower())
+
+    def get_by_natural_key(self, username):
+        return self.filter_email(username).get()
+
     def create_superuser(self, email=None, password=None, **extra_fields):
         """Create and return a new superuser."""
         user = self.create_user(email, password, **extra_fields)
@@ -81,6 +103,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_support = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = UserManager()
 
@@ -99,7 +122,8 @@ class User(AbstractBaseUser, PermissionsMixin):
                 fields=['passport_number'],
                 name='unique_passport_number',
                 condition=~models.Q(passport_number=None)
-            )
+            ),
+            models.UniqueConstraint(Lower('email'), name='unique_email_lower'),
         ]
 
     def __str__(self):
@@ -133,9 +157,31 @@ class PropertyUnit(models.Model):
     is_listed_for_sale = models.BooleanField(default=False)
     amenities = models.JSONField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL, see migration 0017.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = 'property_units'
+        indexes = [
+            models.Index(fields=['property_project', 'unit_name', 'id'], name='unit_project_name_id_idx'),
+            models.Index(fields=['price', 'id'], name='unit_price_id_idx'),
+            models.Index(fields=['property_project', 'price', 'id'], name='unit_project_price_id_idx'),
+            models.Index(fields=['unit_type', 'price', 'id'], name='unit_type_price_id_idx'),
+            models.Index(fields=['purpose', 'price', 'id'], name='unit_purpose_price_id_idx'),
+            models.Index(
+                fields=['price', 'id'],
+                name='unit_rent_price_id_idx',
+                condition=models.Q(is_listed_for_rent=True)
+            ),
+            models.Index(
+                fields=['price', 'id'],
+                name='unit_sale_price_id_idx',
+                condition=models.Q(is_listed_for_sale=True)
+            ),
+            # GIN indexes on amenities (0016), search_vector and unit_name
+            # trigrams (0017) live in migrations, PostgreSQL only.
+        ]
 
     def __str__(self):
         return f"{self.property_project.name} {self.unit_type} {self.unit_number}"
@@ -145,6 +191,8 @@ class PropertyUnit(models.Model):
 class PropertyUnitImage(models.Model):
     property_unit = models.ForeignKey(PropertyUnit, on_delete=models.CASCADE, related_name='gallery')
     image = models.ImageField(upload_to='property_units/gallery/')
+    # Resized copies of image, written by core.images.
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -185,9 +233,12 @@ class Tenancy(models.Model):
     payment_due_date = models.DateField(null=True, blank=True)
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'tenancies'
+        # Exclusion constraint tenancy_no_overlap (no two active tenancies of a
+        # unit over the same dates) lives in migration 0022 (PostgreSQL only).
 
     def __str__(self):
         return f"Tenancy for {self.tenant.email} in {self.property_unit.unit_name}"
@@ -237,15 +288,99 @@ class Booking(models.Model):
     payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUSES, default='pending')
     booking_status = models.CharField(max_length=20, choices=BOOKING_STATUSES, default='confirmed')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'bookings'
+        indexes = [
+            models.Index(fields=['property_unit_id', 'check_in', 'id'], name='booking_unit_check_in_id_idx'),
+            models.Index(fields=['booking_status', 'check_in', 'id'], name='booking_status_check_in_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='booking_created_id_idx'),
+        ]
+        # Exclusion constraint booking_no_overlap (no two bookings of a unit over
+        # the same time unless cancelled) lives in migration 0023 (PostgreSQL only).
 
     def __str__(self):
         return f"Booking by {self.guest.email} for {self.property_unit.unit_number}"
 
 
 
+class RateRule(models.Model):
+    """
+    Nightly price of a unit for the nights matching the rule's date range
+    and weekdays, replacing PropertyUnit.price; see core.pricing.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    property_unit = models.ForeignKey(PropertyUnit, on_delete=models.CASCADE, related_name='rate_rules')
+    name = models.CharField(max_length=100)
+    start_date = models.DateField(blank=True, null=True, help_text="First night covered; open when empty")
+    end_date = models.DateField(blank=True, null=True, help_text="Last night covered; open when empty")
+    weekdays = models.JSONField(
+        blank=True, null=True, help_text="ISO weekdays covered (1 = Monday ... 7 = Sunday); every day when empty"
+    )
+    nightly_price = models.DecimalField(max_digits=12, decimal_places=2)
+    priority = models.IntegerField(default=0, help_text="The highest priority rule matching a night wins")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'rate_rules'
+
+    def __str__(self):
+        return f"{self.name} ({self.nightly_price})"
+
+
+class StayDiscount(models.Model):
+    """Percentage off a unit's stay total from a minimum number of nights; see core.pricing."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    property_unit = models.ForeignKey(PropertyUnit, on_delete=models.CASCADE, related_name='stay_discounts')
+    min_nights = models.PositiveIntegerField()
+    percent = models.DecimalField(max_digits=5, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'stay_discounts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['property_unit', 'min_nights'],
+                name='unique_stay_discount_per_unit_nights'
+            ),
+            models.CheckConstraint(
+                condition=models.Q(percent__gte=0, percent__lte=100),
+                name='stay_discount_percent_range'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.percent}% from {self.min_nights} nights"
+
+
+class ProjectMonthlySummary(models.Model):
+    """Precomputed occupancy and rent figures for one project and month, see core.rollups."""
+    property_project = models.ForeignKey(PropertyProject, on_delete=models.CASCADE, related_name='monthly_summaries')
+    month = models.DateField(help_text="First day of the summarised month")
+    unit_count = models.PositiveIntegerField(default=0)
+    occupied_units = models.PositiveIntegerField(default=0)
+    active_tenancies = models.PositiveIntegerField(default=0)
+    expected_rent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    collected_rent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'project_monthly_summaries'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['property_project', 'month'],
+                name='unique_summary_per_project_month'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.property_project_id} {self.month:%Y-%m}"
+
+
+
 # class Sale(models.Model):
 #     property_unit_id = models.OneToOneField(PropertyUnit, on_delete=models.CASCADE, related_name='sale')
 #     buyer_id = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class RunPostgreSQL(migrations.RunSQL):
+    """
+    RunSQL that only executes on PostgreSQL.
+
+    Used for PostgreSQL-only objects (GIN/GiST indexes, triggers, exclusion
+    constraints) so the schema can still be created on SQLite for local
+    tests, where the application falls back to portable queries.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,134 @@
+"""
+Server-side booking prices.
+
+A unit's rate table holds its base nightly price (PropertyUnit.price), its
+RateRule rows (nightly prices for date ranges and/or weekdays, highest
+priority first) and its StayDiscount rows (percent off from a number of
+nights, longest first). Tables are cached under
+``pricing:table:<unit id>:<version>``; the version ``pricing:version:<unit
+id>`` is bumped on commit when the unit or its rules change (see
+core.signals).
+
+quote_many() prices one stay for any number of units with two cache round
+trips, plus three queries for the units whose table is not cached (and one
+to check that units without a version yet exist).
+"""
+import time
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.models import PropertyUnit, RateRule, StayDiscount
+
+
+CENT = Decimal('0.01')
+
+
+def version_key(unit_id):
+    return f'pricing:version:{unit_id}'
+
+
+def table_key(unit_id, version):
+    return f'pricing:table:{unit_id}:{version}'
+
+
+def get_versions(unit_ids):
+    """
+    Versions of the existing units among `unit_ids`, keyed by str(unit id).
+    Versions are only created for units found in the database, so made-up
+    ids never leave keys behind.
+    """
+    keys = {str(unit_id): version_key(unit_id) for unit_id in unit_ids}
+    found = cache.get_many(list(keys.values()))
+    versions = {unit_id: found[key] for unit_id, key in keys.items() if key in found}
+    unversioned = [unit_id for unit_id in keys if unit_id not in versions]
+    if unversioned:
+        for unit_id in PropertyUnit.objects.filter(pk__in=unversioned).values_list('id', flat=True):
+            key = keys[str(unit_id)]
+            # Never restart at a small number after an eviction (see core.response_cache).
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[str(unit_id)] = cache.get(key)
+    return versions
+
+
+def bump_unit_version(unit_id):
+    """Drop the cached rate table of a unit once the current transaction commits."""
+    def bump():
+        try:
+            cache.incr(version_key(unit_id))
+        except ValueError:
+            pass  # No version yet, so nothing is cached under it.
+    transaction.on_commit(bump)
+
+
+def build_tables(unit_ids):
+    tables = {
+        str(unit_id): {'price': price, 'rules': [], 'discounts': []}
+        for unit_id, price in PropertyUnit.objects.filter(pk__in=unit_ids).values_list('id', 'price')
+    }
+    rules = RateRule.objects.filter(property_unit_id__in=tables).order_by('-priority', '-start_date', 'id')
+    for unit_id, start, end, weekdays, price in rules.values_list(
+        'property_unit_id', 'start_date', 'end_date', 'weekdays', 'nightly_price'
+    ):
+        tables[str(unit_id)]['rules'].append((start, end, frozenset(weekdays or ()), price))
+    discounts = StayDiscount.objects.filter(property_unit_id__in=tables).order_by('-min_nights')
+    for unit_id, min_nights, percent in discounts.values_list('property_unit_id', 'min_nights', 'percent'):
+        tables[str(unit_id)]['discounts'].append((min_nights, percent))
+    return tables
+
+
+def get_rate_tables(unit_ids):
+    """Rate tables of the existing units among `unit_ids`, keyed by str(unit id)."""
+    versions = get_versions(unit_ids)
+    keys = {table_key(unit_id, version): unit_id for unit_id, version in versions.items()}
+    cached = cache.get_many(list(keys))
+    tables = {keys[key]: table for key, table in cached.items()}
+    missing = [unit_id for unit_id in versions if unit_id not in tables]
+    if missing:
+        built = build_tables(missing)
+        cache.set_many(
+            {table_key(unit_id, versions[unit_id]): table for unit_id, table in built.items()},
+            timeout=settings.PRICING_CACHE_TIMEOUT
+        )
+        tables.update(built)
+    return tables
+
+
+def nightly_price(table, night):
+    for start, end, weekdays, price in table['rules']:
+        if (start and night < start) or (end and night > end):
+            continue
+        if weekdays and night.isoweekday() not in weekdays:
+            continue
+        return price
+    return table['price']
+
+
+def quote(table, check_in, check_out):
+    """
+    Price of the nights from date `check_in` up to date `check_out`; a
+    same-day stay is charged one night.
+    """
+    nights = max((check_out - check_in).days, 1)
+    subtotal = sum(
+        (nightly_price(table, check_in + timedelta(days=night)) for night in range(nights)),
+        Decimal('0.00')
+    )
+    percent = next((percent for min_nights, percent in table['discounts'] if nights >= min_nights), Decimal('0'))
+    discount = (subtotal * percent / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+    return {
+        'nights': nights,
+        'subtotal': subtotal,
+        'discount_percent': percent,
+        'discount': discount,
+        'total': subtotal - discount,
+    }
+
+
+def quote_many(unit_ids, check_in, check_out):
+    """quote() for every existing unit in `unit_ids`, keyed by str(unit id)."""
+    tables = get_rate_tables(unit_ids)
+    return {unit_id: quote(table, check_in, check_out) for unit_id, table in tables.items()}
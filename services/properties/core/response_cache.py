@@ -0,0 +1,81 @@
+"""
+Versioned cache of rendered project and unit responses.
+
+Cached payloads are keyed by the request's host, path and query string plus
+the current value of one or more version counters:
+
+* ``projects`` - bumped on every change to any project or unit data, used
+  by lists that can span projects;
+* ``project:<id>`` - bumped when data belonging to that project changes,
+  used by details and by lists filtered to one project.
+
+Nothing is ever deleted: bumping a counter makes the old keys unreachable
+and they age out of the cache. Counters are bumped on transaction commit
+from the signal handlers in core.signals.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+ALL_PROJECTS = 'projects'
+
+
+def project_scope(project_id):
+    return f'project:{project_id}'
+
+
+def version_key(scope):
+    return f'responses:version:{scope}'
+
+
+def initial_version():
+    # Never restart at a small number after an eviction, or entries cached
+    # under the old counter value could become reachable again.
+    return time.time_ns()
+
+
+def get_versions(scopes):
+    keys = {version_key(scope): scope for scope in scopes}
+    versions = cache.get_many(list(keys))
+    for key in keys:
+        if key not in versions:
+            cache.add(key, initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(scopes):
+    for scope in scopes:
+        key = version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, initial_version(), timeout=None)
+
+
+def bump_project_versions(*project_ids):
+    """Invalidate cached responses of the given projects (and all cross-project lists) on commit."""
+    scopes = [ALL_PROJECTS] + [project_scope(pk) for pk in set(project_ids) if pk]
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def response_digest(request, scopes):
+    """Digest of the request and the current versions of `scopes`; changes whenever a response could."""
+    versions = get_versions(scopes)
+    raw = '|'.join([request.get_host(), request.get_full_path(), *map(str, scopes), *map(str, versions)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def cached_response_data(request, scopes, build):
+    """Return cached response data for `request`, calling build() to produce it on a miss."""
+    key = 'responses:data:' + response_digest(request, scopes)
+
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,69 @@
+"""
+In-process registry of Role rows.
+
+Roles are seeded once (seed_roles) and almost never change, so every
+process loads the whole table on first use and answers name and id lookups
+from memory. A version counter in the shared cache, bumped on commit when a
+role is saved or deleted (see core.signals), tells every process to reload.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core.models import Role
+
+
+VERSION_KEY = 'roles:version'
+
+_lock = threading.Lock()
+_registry = {'version': None, 'by_name': {}, 'by_id': {}}
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Never restart at a small number after an eviction (see core.response_cache).
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Make every process reload its roles once the current transaction commits."""
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+    transaction.on_commit(bump)
+
+
+def registry():
+    version = get_version()
+    if _registry['version'] != version:
+        with _lock:
+            if _registry['version'] != version:
+                roles = list(Role.objects.all())
+                _registry.update(
+                    by_name={role.name: role for role in roles},
+                    by_id={str(role.pk): role for role in roles},
+                    version=version,
+                )
+    return _registry
+
+
+def get_role(name):
+    """The Role called `name`; raises Role.DoesNotExist like Role.objects.get(name=name)."""
+    try:
+        return registry()['by_name'][name]
+    except KeyError:
+        raise Role.DoesNotExist(f"Role '{name}' does not exist.")
+
+
+def get_role_by_id(pk):
+    try:
+        return registry()['by_id'][str(pk)]
+    except KeyError:
+        raise Role.DoesNotExist(f"Role '{pk}' does not exist.")
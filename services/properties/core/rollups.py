@@ -0,0 +1,208 @@
+"""
+Occupancy and revenue rollups per property project and month.
+
+ProjectMonthlySummary rows are derived data: refresh_project_months()
+recomputes a month range for one project with three reads and one upsert
+(compute_project_months() does the reads alone),
+and is called from the signal handlers in core.signals whenever units,
+tenancies or rent transactions change. The rebuild_project_summaries
+management command recomputes everything from scratch.
+"""
+import calendar
+import threading
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Min, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from core.models import (
+    ProjectMonthlySummary,
+    PropertyProject,
+    PropertyUnit,
+    RentTransaction,
+    Tenancy,
+)
+
+
+SUMMARY_FIELDS = [
+    'unit_count', 'occupied_units', 'active_tenancies',
+    'expected_rent', 'collected_rent', 'refreshed_at',
+]
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def month_end(month):
+    return date(month.year, month.month, calendar.monthrange(month.year, month.month)[1])
+
+
+def add_months(month, count):
+    year, index = divmod(month.year * 12 + month.month - 1 + count, 12)
+    return date(year, index + 1, 1)
+
+
+def month_count(first, last):
+    """Number of months from first to last, both included."""
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+
+def next_month(month):
+    return add_months(month, 1)
+
+
+def iter_months(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+
+def current_month():
+    return month_start(timezone.localdate())
+
+
+def counted_tenancies():
+    """
+    Tenancies that count towards occupancy for the months their dates cover.
+    A tenancy deactivated without an end date is treated as void.
+    """
+    return Tenancy.objects.filter(Q(active=True) | Q(tenancy_end_date__isnull=False))
+
+
+def compute_project_months(project_id, first, last=None):
+    """
+    Unsaved summaries of one project for every month from first to last (at
+    most the current month), computed with three reads.
+    """
+    first = month_start(first)
+    last = min(month_start(last), current_month()) if last else current_month()
+    if last < first:
+        return []
+    range_end = month_end(last)
+
+    unit_dates = list(
+        PropertyUnit.objects.filter(property_project_id=project_id).values_list('created_at', flat=True)
+    )
+    tenancies = list(
+        counted_tenancies()
+        .filter(property_unit__property_project_id=project_id, tenancy_start_date__lte=range_end)
+        .filter(Q(tenancy_end_date__isnull=True) | Q(tenancy_end_date__gte=first))
+        .values_list('property_unit_id', 'tenancy_start_date', 'tenancy_end_date', 'monthly_rent')
+    )
+    collected = dict(
+        RentTransaction.objects.filter(
+            tenancy__property_unit__property_project_id=project_id,
+            payment_status='completed',
+            transaction_date__gte=timezone.make_aware(datetime.combine(first, time.min)),
+            transaction_date__lt=timezone.make_aware(datetime.combine(next_month(last), time.min)),
+        )
+        .annotate(month=TruncMonth('transaction_date'))
+        .values('month')
+        .annotate(total=Sum('amount'))
+        .values_list('month', 'total')
+    )
+    collected = {month_start(month): total for month, total in collected.items()}
+
+    refreshed_at = timezone.now()
+    summaries = []
+    for month in iter_months(first, last):
+        end = month_end(month)
+        occupied = set()
+        active = 0
+        expected = Decimal('0')
+        for unit_id, start_date, end_date, rent in tenancies:
+            if start_date <= end and (end_date is None or end_date >= month):
+                occupied.add(unit_id)
+                active += 1
+                expected += rent or 0
+        summaries.append(ProjectMonthlySummary(
+            property_project_id=project_id,
+            month=month,
+            unit_count=sum(1 for created in unit_dates if timezone.localdate(created) <= end),
+            occupied_units=len(occupied),
+            active_tenancies=active,
+            expected_rent=expected,
+            collected_rent=collected.get(month, Decimal('0')),
+            refreshed_at=refreshed_at,
+        ))
+    return summaries
+
+
+def refresh_project_months(project_id, first, last=None):
+    """Recompute and store the summaries of one project for every month from first to last."""
+    summaries = compute_project_months(project_id, first, last)
+    if not summaries:
+        return []
+    return ProjectMonthlySummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['property_project', 'month'],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def first_activity_month(project_id):
+    """Earliest month in which the project has a unit, tenancy or rent transaction."""
+    dates = [
+        PropertyUnit.objects.filter(property_project_id=project_id).aggregate(first=Min('created_at'))['first'],
+        Tenancy.objects.filter(property_unit__property_project_id=project_id).aggregate(first=Min('tenancy_start_date'))['first'],
+        RentTransaction.objects.filter(
+            tenancy__property_unit__property_project_id=project_id
+        ).aggregate(first=Min('transaction_date'))['first'],
+    ]
+    dates = [timezone.localdate(value) if isinstance(value, datetime) else value for value in dates if value]
+    return month_start(min(dates)) if dates else None
+
+
+def rebuild_project(project_id):
+    """Drop and recompute every summary of one project."""
+    with transaction.atomic():
+        ProjectMonthlySummary.objects.filter(property_project_id=project_id).delete()
+        first = first_activity_month(project_id)
+        if first is None:
+            return []
+        return refresh_project_months(project_id, first)
+
+
+def rebuild_all():
+    for project_id in PropertyProject.objects.values_list('id', flat=True).iterator():
+        yield project_id, rebuild_project(project_id)
+
+
+_pending = threading.local()
+
+
+def schedule_refresh(project_id, first):
+    """
+    Queue a refresh of project_id from the month of first onwards. Refreshes
+    are collapsed per project and run once the surrounding transaction
+    commits (immediately in autocommit mode). Entries left behind by a
+    rolled back transaction are simply recomputed by the next flush.
+    """
+    if project_id is None or first is None:
+        return
+    if isinstance(first, datetime):
+        first = timezone.localdate(first)
+    first = month_start(first)
+
+    queue = getattr(_pending, 'projects', None)
+    if queue is None:
+        queue = _pending.projects = {}
+    queue[project_id] = min(first, queue.get(project_id, first))
+    transaction.on_commit(flush_scheduled_refreshes)
+
+
+def flush_scheduled_refreshes():
+    queue = getattr(_pending, 'projects', None)
+    if not queue:
+        return
+    _pending.projects = {}
+    existing = set(PropertyProject.objects.filter(pk__in=list(queue)).values_list('id', flat=True))
+    for project_id, first in queue.items():
+        if project_id in existing:
+            refresh_project_months(project_id, first)
@@ -0,0 +1,255 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.images import IMAGE_FIELDS, discard_variants, needs_variants, schedule_variants
+from core.pricing import bump_unit_version as bump_pricing_version
+from core.models import (
+    PropertyProject,
+    PropertyUnit,
+    PropertyUnitImage,
+    RateRule,
+    RentTransaction,
+    Role,
+    StayDiscount,
+    Tenancy,
+    TenantProfile,
+    User,
+)
+from core.response_cache import bump_project_versions
+from core.roles import bump_version as bump_role_version
+from core.rollups import schedule_refresh
+from core.user_cache import bump_payload_version, bump_user_version
+
+
+# Project monthly summaries
+
+def unit_project_id(unit_id):
+    return PropertyUnit.objects.filter(pk=unit_id).values_list('property_project_id', flat=True).first()
+
+
+@receiver(pre_save, sender=PropertyUnit)
+def remember_previous_unit_project(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._previous_project_id = unit_project_id(instance.pk)
+
+
+@receiver(post_save, sender=PropertyUnit)
+@receiver(post_delete, sender=PropertyUnit)
+def refresh_summaries_for_unit(sender, instance, **kwargs):
+    schedule_refresh(instance.property_project_id, instance.created_at)
+    previous = getattr(instance, '_previous_project_id', None)
+    if previous and previous != instance.property_project_id:
+        schedule_refresh(previous, instance.created_at)
+
+
+@receiver(pre_save, sender=Tenancy)
+def remember_previous_tenancy(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._previous_tenancy = Tenancy.objects.filter(pk=instance.pk).values(
+            'tenancy_start_date', 'property_unit_id', 'tenant_id', 'property_unit__property_project_id'
+        ).first()
+
+
+@receiver(pre_delete, sender=Tenancy)
+def remember_deleted_tenancy_project(sender, instance, **kwargs):
+    instance._project_id = unit_project_id(instance.property_unit_id)
+
+
+@receiver(post_save, sender=Tenancy)
+@receiver(post_delete, sender=Tenancy)
+def refresh_summaries_for_tenancy(sender, instance, **kwargs):
+    project_id = getattr(instance, '_project_id', None) or unit_project_id(instance.property_unit_id)
+    schedule_refresh(project_id, instance.tenancy_start_date)
+    previous = getattr(instance, '_previous_tenancy', None)
+    if previous:
+        schedule_refresh(previous['property_unit__property_project_id'], previous['tenancy_start_date'])
+
+
+@receiver(pre_delete, sender=RentTransaction)
+def remember_deleted_transaction_project(sender, instance, **kwargs):
+    instance._project_id = Tenancy.objects.filter(pk=instance.tenancy_id).values_list(
+        'property_unit__property_project_id', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=RentTransaction)
+@receiver(post_delete, sender=RentTransaction)
+def refresh_summaries_for_transaction(sender, instance, **kwargs):
+    project_id = getattr(instance, '_project_id', None) or Tenancy.objects.filter(
+        pk=instance.tenancy_id
+    ).values_list('property_unit__property_project_id', flat=True).first()
+    schedule_refresh(project_id, instance.transaction_date)
+
+
+# Photo variants
+
+@receiver(post_save, sender=PropertyProject)
+@receiver(post_save, sender=PropertyUnitImage)
+def render_photo_variants(sender, instance, **kwargs):
+    image_field, variants_field = IMAGE_FIELDS[sender._meta.label]
+    if needs_variants(instance):
+        schedule_variants(instance)
+    elif not getattr(instance, image_field).name and discard_variants(instance):
+        # The image was cleared: its variants go, and so does the row's record of them.
+        sender.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+
+
+@receiver(pre_delete, sender=PropertyProject)
+@receiver(pre_delete, sender=PropertyUnitImage)
+def delete_photo_variants(sender, instance, **kwargs):
+    discard_variants(instance)
+
+
+# Representation timestamps
+#
+# Units embed their project name, gallery and active tenant profile, and
+# users embed their roles and active tenancy, so changes to those rows bump
+# the parent's updated_at (with queryset updates, which fire no signals).
+# Conditional GETs (core.conditional) rely on this.
+
+def touch(model, **filters):
+    model.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=PropertyProject)
+def touch_project_units(sender, instance, created, **kwargs):
+    if not created:
+        touch(PropertyUnit, property_project_id=instance.pk)
+
+
+@receiver(post_save, sender=PropertyUnitImage)
+@receiver(post_delete, sender=PropertyUnitImage)
+def touch_image_unit(sender, instance, **kwargs):
+    touch(PropertyUnit, pk=instance.property_unit_id)
+
+
+@receiver(post_save, sender=Tenancy)
+@receiver(post_delete, sender=Tenancy)
+def touch_tenancy_unit_and_tenant(sender, instance, **kwargs):
+    touch(PropertyUnit, pk=instance.property_unit_id)
+    touch(User, pk=instance.tenant_id)
+    previous = getattr(instance, '_previous_tenancy', None)
+    if previous and previous['property_unit_id'] != instance.property_unit_id:
+        touch(PropertyUnit, pk=previous['property_unit_id'])
+    if previous and previous['tenant_id'] != instance.tenant_id:
+        touch(User, pk=previous['tenant_id'])
+
+
+@receiver(post_save, sender=TenantProfile)
+@receiver(post_delete, sender=TenantProfile)
+def touch_profile_units(sender, instance, **kwargs):
+    touch(PropertyUnit, tenancies__tenant_id=instance.user_id, tenancies__active=True)
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def touch_user_roles(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, User):
+        touch(User, pk=instance.pk)
+    elif pk_set:
+        touch(User, pk__in=pk_set)
+
+
+# Response cache versions (core.response_cache)
+
+@receiver(post_save, sender=PropertyProject)
+@receiver(post_delete, sender=PropertyProject)
+def invalidate_project_responses(sender, instance, **kwargs):
+    bump_project_versions(instance.pk)
+
+
+@receiver(post_save, sender=PropertyUnit)
+@receiver(post_delete, sender=PropertyUnit)
+def invalidate_unit_responses(sender, instance, **kwargs):
+    bump_project_versions(instance.property_project_id, getattr(instance, '_previous_project_id', None))
+
+
+@receiver(post_save, sender=PropertyUnitImage)
+@receiver(post_delete, sender=PropertyUnitImage)
+def invalidate_image_responses(sender, instance, **kwargs):
+    bump_project_versions(unit_project_id(instance.property_unit_id))
+
+
+@receiver(post_save, sender=Tenancy)
+@receiver(post_delete, sender=Tenancy)
+def invalidate_tenancy_responses(sender, instance, **kwargs):
+    project_id = getattr(instance, '_project_id', None) or unit_project_id(instance.property_unit_id)
+    previous = getattr(instance, '_previous_tenancy', None) or {}
+    bump_project_versions(project_id, previous.get('property_unit__property_project_id'))
+
+
+@receiver(post_save, sender=TenantProfile)
+@receiver(post_delete, sender=TenantProfile)
+def invalidate_tenant_profile_responses(sender, instance, **kwargs):
+    project_ids = PropertyUnit.objects.filter(
+        tenancies__tenant_id=instance.user_id, tenancies__active=True
+    ).values_list('property_project_id', flat=True).distinct()
+    bump_project_versions(*project_ids)
+
+
+# Cached users (core.user_cache)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=Tenancy)
+@receiver(post_delete, sender=Tenancy)
+def invalidate_cached_tenant(sender, instance, **kwargs):
+    bump_payload_version(instance.tenant_id)
+    previous = getattr(instance, '_previous_tenancy', None)
+    if previous and previous['tenant_id'] != instance.tenant_id:
+        bump_payload_version(previous['tenant_id'])
+
+
+@receiver(post_save, sender=PropertyUnit)
+def invalidate_cached_unit_tenants(sender, instance, created, **kwargs):
+    if created:
+        return
+    for user_id in Tenancy.objects.filter(property_unit_id=instance.pk, active=True).values_list('tenant_id', flat=True):
+        bump_payload_version(user_id)
+
+
+@receiver(post_save, sender=PropertyProject)
+def invalidate_cached_project_users(sender, instance, created, **kwargs):
+    if created:
+        return
+    for user_id in User.objects.filter(property_project_id=instance.pk).values_list('pk', flat=True):
+        bump_payload_version(user_id)
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_cached_user_roles(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    user_ids = [instance.pk] if isinstance(instance, User) else pk_set or []
+    for user_id in user_ids:
+        bump_user_version(user_id)
+
+
+# Role registry (core.roles)
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_registry(sender, instance, **kwargs):
+    bump_role_version()
+
+
+# Rate tables (core.pricing)
+
+@receiver(post_save, sender=PropertyUnit)
+def invalidate_unit_rate_table(sender, instance, created, **kwargs):
+    if not created:
+        bump_pricing_version(instance.pk)
+
+
+@receiver(post_save, sender=RateRule)
+@receiver(post_delete, sender=RateRule)
+@receiver(post_save, sender=StayDiscount)
+@receiver(post_delete, sender=StayDiscount)
+def invalidate_rule_rate_table(sender, instance, **kwargs):
+    bump_pricing_version(instance.property_unit_id)
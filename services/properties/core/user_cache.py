@@ -0,0 +1,131 @@
+"""
+Cached user loading for JWT authentication.
+
+Users are cached in two tiers:
+
+* the shared cache, under ``users:data:<id>:<version>``, where the version
+  counter ``users:version:<id>`` is bumped on commit whenever the user row
+  or its roles change (see core.signals);
+* a small in-process LRU in front of it, whose entries are trusted for
+  USER_CACHE_LOCAL_TIMEOUT seconds without consulting the shared version.
+
+A deactivated or changed user is therefore seen by every worker within
+USER_CACHE_LOCAL_TIMEOUT seconds, and immediately by the worker that
+committed the change. Entries are pickled so each request gets its own
+instance.
+
+The same version also backs the access token's user version claim (see
+core.authentication). The cached /logged-in-user/ and /me/ payloads
+(cached_user_payload) embed more than the user row, so they are keyed by a
+second counter, ``users:payload-version:<id>``, which is also bumped when
+the user's tenancy, unit or project changes (bump_payload_version).
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def version_key(user_id):
+    return f'users:version:{user_id}'
+
+
+def data_key(user_id, version):
+    return f'users:data:{user_id}:{version}'
+
+
+def payload_version_key(user_id):
+    return f'users:payload-version:{user_id}'
+
+
+def get_version(user_id, key_func=version_key):
+    key = key_func(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Never restart at a small number after an eviction (see core.response_cache).
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def forget_local(user_id):
+    with _local_lock:
+        _local.pop(str(user_id), None)
+
+
+def remember_local(user_id, payload):
+    with _local_lock:
+        _local[str(user_id)] = (time.monotonic() + settings.USER_CACHE_LOCAL_TIMEOUT, payload)
+        _local.move_to_end(str(user_id))
+        while len(_local) > settings.USER_CACHE_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+def recall_local(user_id):
+    with _local_lock:
+        entry = _local.get(str(user_id))
+        if entry is None:
+            return None
+        expires, payload = entry
+        if expires < time.monotonic():
+            del _local[str(user_id)]
+            return None
+        _local.move_to_end(str(user_id))
+        return payload
+
+
+def bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass  # No version yet, so nothing is cached under it.
+
+
+def bump_user_version(user_id):
+    """Invalidate the cached user, its token claims and its payloads on commit."""
+    def bump_all():
+        forget_local(user_id)
+        bump(version_key(user_id))
+        bump(payload_version_key(user_id))
+    transaction.on_commit(bump_all)
+
+
+def bump_payload_version(user_id):
+    """Invalidate only the cached payloads of a user, whose row and roles did not change, on commit."""
+    transaction.on_commit(lambda: bump(payload_version_key(user_id)))
+
+
+def cached_user_payload(user_id, name, build):
+    """
+    Response data `name` of user `user_id`, cached under the user's payload
+    version; build() produces it on a miss. Besides the user row and roles,
+    that version is bumped when their tenancy, unit or project changes.
+    """
+    key = f'users:payload:{name}:{user_id}:{get_version(user_id, payload_version_key)}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=settings.USER_CACHE_TIMEOUT)
+    return data
+
+
+def load_user(user_id):
+    """Return the User with pk `user_id`, from cache when possible; raises User.DoesNotExist."""
+    payload = recall_local(user_id)
+    if payload is None:
+        key = data_key(user_id, get_version(user_id))
+        payload = cache.get(key)
+        if payload is None:
+            payload = pickle.dumps(get_user_model().objects.get(pk=user_id))
+            cache.set(key, payload, timeout=settings.USER_CACHE_TIMEOUT)
+        remember_local(user_id, payload)
+    return pickle.loads(payload)
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'rest_framework',
     'rest_framework.authtoken',
@@ -99,6 +100,36 @@ else:
     }
 
 
+# Cache
+# Local memory by default (and in tests); set REDIS_URL to share it between workers.
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a rendered project/unit response stays cached (core.response_cache).
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Users loaded by JWT authentication (core.user_cache): shared cache lifetime,
+# and how long (and how many) each process keeps without rechecking.
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', 300))
+USER_CACHE_LOCAL_TIMEOUT = int(os.getenv('USER_CACHE_LOCAL_TIMEOUT', 5))
+USER_CACHE_LOCAL_SIZE = int(os.getenv('USER_CACHE_LOCAL_SIZE', 1024))
+
+# Seconds a unit's booking rate table stays cached (core.pricing).
+PRICING_CACHE_TIMEOUT = int(os.getenv('PRICING_CACHE_TIMEOUT', 3600))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -147,6 +178,9 @@ if not DEBUG:
 
     STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Worker processes rendering resized photo variants (core.images); 0 renders inline.
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -173,15 +207,29 @@ REST_FRAMEWORK = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'core.authentication.ClaimsJWTAuthentication',
+    ),
+    # Login attempts (user.throttling), checked before any password hashing.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('LOGIN_IP_RATE', '30/minute'),
+        'login_email': os.getenv('LOGIN_EMAIL_RATE', '10/minute'),
+    },
 }
 
+# Concurrent password hashes per worker during login, and how many seconds an
+# attempt waits for a free slot before it is rejected (user.throttling).
+LOGIN_HASH_CONCURRENCY = int(os.getenv('LOGIN_HASH_CONCURRENCY', 2))
+LOGIN_HASH_WAIT = float(os.getenv('LOGIN_HASH_WAIT', 1))
+
+# Processes hashing passwords during bulk tenant imports (user.imports); 0 hashes in-process.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_USER_CLASS': 'core.authentication.ClaimsTokenUser',
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -0,0 +1,57 @@
+from rest_framework import serializers
+from core.filters import QueryParamFilter
+from core.models import PropertyUnit
+
+
+class PropertyUnitFilter(QueryParamFilter):
+    """
+    Translates unit list query params into indexed queryset filters.
+
+    Every filter maps onto one of the PropertyUnit indexes: the
+    (unit_type | purpose | property_project, price, id) composites, the
+    partial (price, id) indexes on the listing flags and the GIN index on
+    amenities. Results always end with an id tie breaker so they can be
+    keyset paginated.
+    """
+    default_ordering = ('property_project__name', 'unit_name', 'id')
+    ordering_fields = ('price', 'created_at', 'unit_name')
+
+    def filter_queryset(self, queryset):
+        filters = {}
+
+        price_min = self.get_decimal('price_min')
+        if price_min is not None:
+            filters['price__gte'] = price_min
+        price_max = self.get_decimal('price_max')
+        if price_max is not None:
+            filters['price__lte'] = price_max
+
+        unit_types = self.get_choices('unit_type', PropertyUnit.UNIT_TYPES)
+        if unit_types:
+            filters['unit_type__in'] = unit_types
+        purposes = self.get_choices('purpose', PropertyUnit.PURPOSE_CHOICES)
+        if purposes:
+            filters['purpose__in'] = purposes
+
+        property_project = self.get_uuid('property_project')
+        if property_project is not None:
+            filters['property_project_id'] = property_project
+
+        for flag in ('is_listed_for_rent', 'is_listed_for_sale'):
+            value = self.get_boolean(flag)
+            if value is not None:
+                filters[flag] = value
+
+        amenity_keys = self.get_list('amenities')
+        if amenity_keys:
+            filters['amenities__has_keys'] = amenity_keys
+        amenities_match = self.get_json_object('amenities_contains')
+        if amenities_match is not None:
+            filters['amenities__contains'] = amenities_match
+
+        ordering = self.get_ordering()
+
+        if self.errors:
+            raise serializers.ValidationError(self.errors)
+
+        return queryset.filter(**filters).order_by(*ordering)
@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.models import PropertyProject, PropertyUnit
+from core.response_cache import bump_project_versions
+from core.rollups import schedule_refresh
+from .serializers import PropertyUnitSerializer
+
+
+class PrefetchedProjectField(serializers.PrimaryKeyRelatedField):
+    """Resolves project ids from the batch's prefetched `projects` context instead of one query per row."""
+
+    def to_internal_value(self, data):
+        try:
+            return self.context['projects'][str(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class PropertyUnitImportSerializer(PropertyUnitSerializer):
+    property_project = PrefetchedProjectField(queryset=PropertyProject.objects.all())
+
+    class Meta(PropertyUnitSerializer.Meta):
+        fields = [
+            'property_project', 'unit_name', 'unit_type', 'purpose', 'price',
+            'is_listed_for_rent', 'is_listed_for_sale', 'amenities'
+        ]
+
+
+class UnitImportError(Exception):
+    pass
+
+
+class UnitImporter:
+    """
+    Validates unit rows with PropertyUnitSerializer rules, a batch at a time,
+    and inserts them all with bulk_create in one transaction. Nothing is
+    inserted if any row is invalid; errors are reported per row (1-based).
+    """
+    batch_size = 1000
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.errors = []
+        self.units = []
+
+    @classmethod
+    def from_file(cls, file, file_format):
+        if file_format == 'json':
+            try:
+                rows = json.load(file)
+            except ValueError as error:
+                raise UnitImportError(f'Invalid JSON: {error}')
+            if not isinstance(rows, list):
+                raise UnitImportError('JSON import must be a list of unit objects.')
+            return cls(rows)
+        if file_format == 'csv':
+            text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+            try:
+                return cls([cls.parse_csv_row(row) for row in csv.DictReader(text)])
+            except UnicodeDecodeError:
+                raise UnitImportError('CSV import must be UTF-8 encoded.')
+            except csv.Error as error:
+                raise UnitImportError(f'Invalid CSV: {error}')
+        raise UnitImportError(f'Unsupported import format "{file_format}".')
+
+    @staticmethod
+    def parse_csv_row(row):
+        row = {key: value for key, value in row.items() if key and value not in (None, '')}
+        if 'amenities' in row:
+            try:
+                row['amenities'] = json.loads(row['amenities'])
+            except ValueError:
+                pass  # Left as a string so the serializer reports it.
+        return row
+
+    def validate(self):
+        for start in range(0, len(self.rows), self.batch_size):
+            batch = self.rows[start:start + self.batch_size]
+            context = {'projects': self.get_projects(batch)}
+            for offset, row in enumerate(batch):
+                serializer = PropertyUnitImportSerializer(data=row, context=context)
+                if serializer.is_valid():
+                    self.units.append(PropertyUnit(**serializer.validated_data))
+                else:
+                    self.errors.append({'row': start + offset + 1, 'errors': serializer.errors})
+        return not self.errors
+
+    def get_projects(self, batch):
+        ids = set()
+        for row in batch:
+            value = row.get('property_project') if isinstance(row, dict) else None
+            if value:
+                ids.add(str(value))
+        valid_ids = []
+        for value in ids:
+            try:
+                valid_ids.append(PropertyProject._meta.pk.to_python(value))
+            except DjangoValidationError:
+                pass  # Reported per row by the serializer.
+        projects = PropertyProject.objects.filter(pk__in=valid_ids) if valid_ids else []
+        return {str(project.pk): project for project in projects}
+
+    def save(self):
+        with transaction.atomic():
+            units = PropertyUnit.objects.bulk_create(self.units, batch_size=self.batch_size)
+            # bulk_create sends no signals: do what core.signals would have done per unit.
+            project_ids = {unit.property_project_id for unit in units}
+            for project_id in project_ids:
+                schedule_refresh(project_id, timezone.now())
+            bump_project_versions(*project_ids)
+        return units
+
+    def run(self):
+        if not self.validate():
+            return None
+        return self.save()
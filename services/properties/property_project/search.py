@@ -0,0 +1,100 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, CharField, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from core.models import PropertyProject, PropertyUnit
+
+
+class ListingSearch:
+    """
+    Ranked search over projects and units, returned as one UNION queryset.
+
+    On PostgreSQL rows match on the trigger-maintained search_vector columns
+    (websearch syntax) or on trigram similarity of project name/address and
+    unit name, and are ranked by ts_rank plus the best trigram similarity.
+    Other backends fall back to icontains matching so the endpoint still
+    works against SQLite in local tests.
+    """
+    kinds = ('projects', 'units')
+    fields = ('kind', 'id', 'name', 'address', 'project_id', 'project_name', 'rank')
+
+    def __init__(self, text, kinds=None):
+        self.text = text.strip()
+        self.kinds = kinds or self.kinds
+
+    def get_queryset(self):
+        querysets = []
+        if 'projects' in self.kinds:
+            querysets.append(self.search_projects())
+        if 'units' in self.kinds:
+            querysets.append(self.search_units())
+        queryset = querysets[0]
+        if len(querysets) > 1:
+            queryset = queryset.union(*querysets[1:], all=True)
+        return queryset.order_by('-rank', 'kind', 'id')
+
+    @property
+    def is_postgresql(self):
+        return connection.vendor == 'postgresql'
+
+    def search_projects(self):
+        projects = PropertyProject.objects.annotate(
+            kind=Value('project', output_field=CharField()),
+            project_id=F('id'),
+            project_name=F('name'),
+        )
+        if self.is_postgresql:
+            query = self.get_search_query()
+            projects = projects.filter(
+                Q(search_vector=query)
+                | Q(name__trigram_similar=self.text)
+                | Q(address__trigram_similar=self.text)
+            ).annotate(
+                rank=SearchRank(F('search_vector'), query) + Greatest(
+                    TrigramSimilarity('name', self.text),
+                    TrigramSimilarity('address', self.text),
+                )
+            )
+        else:
+            projects = projects.filter(
+                Q(name__icontains=self.text)
+                | Q(address__icontains=self.text)
+                | Q(description__icontains=self.text)
+            ).annotate(rank=self.get_fallback_rank('name'))
+        return projects.values(*self.fields)
+
+    def search_units(self):
+        units = PropertyUnit.objects.annotate(
+            kind=Value('unit', output_field=CharField()),
+            name=F('unit_name'),
+            address=F('property_project__address'),
+            project_id=F('property_project_id'),
+            project_name=F('property_project__name'),
+        )
+        if self.is_postgresql:
+            query = self.get_search_query()
+            units = units.filter(
+                Q(search_vector=query) | Q(unit_name__trigram_similar=self.text)
+            ).annotate(
+                rank=SearchRank(F('search_vector'), query) + TrigramSimilarity('unit_name', self.text)
+            )
+        else:
+            units = units.filter(
+                Q(unit_name__icontains=self.text)
+                | Q(unit_type__icontains=self.text)
+                | Q(purpose__icontains=self.text)
+            ).annotate(rank=self.get_fallback_rank('unit_name'))
+        return units.values(*self.fields)
+
+    def get_search_query(self):
+        return SearchQuery(self.text, config='english', search_type='websearch')
+
+    def get_fallback_rank(self, field):
+        return Case(
+            When(**{f'{field}__iexact': self.text}, then=Value(1.0)),
+            When(**{f'{field}__istartswith': self.text}, then=Value(0.75)),
+            When(**{f'{field}__icontains': self.text}, then=Value(0.5)),
+            default=Value(0.25),
+            output_field=FloatField(),
+        )
@@ -1,7 +1,14 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
 from rest_framework import serializers
+from core.images import variant_urls
 from core.models import (
+    ProjectMonthlySummary,
     PropertyProject, 
     PropertyUnit, 
+    PropertyUnitImage,
     TenantProfile,
     Tenancy
 )
@@ -9,23 +16,79 @@ from core.models import (
 from django.utils import timezone
 
 class PropertyProjectSerializer(serializers.ModelSerializer):
+    cover_photo_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = PropertyProject
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ('id',)
 
+    def get_cover_photo_variants(self, obj):
+        return variant_urls(obj.cover_photo, obj.cover_photo_variants)
+
     def validate_name(self, value):
         value = value.strip()
         if not value:
             raise serializers.ValidationError("Project name cannot be empty.")
             
-        qs = PropertyProject.objects.filter(name__iexact=value)
+        qs = self.same_name(value)
         if self.instance:  # On update
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
             raise serializers.ValidationError("A project with this name already exists.")
         return value
+
+    @staticmethod
+    def same_name(name):
+        """Projects named `name` in any case, served by the unique index on LOWER(name)."""
+        return PropertyProject.objects.annotate(name_lower=Lower('name')).filter(name_lower=name.lower())
+
+    def save(self, **kwargs):
+        # A concurrent request can take the name after validate_name passed;
+        # the unique index then rejects the insert or update.
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            name = self.validated_data.get('name')
+            if name and self.same_name(name).exclude(pk=getattr(self.instance, 'pk', None)).exists():
+                raise serializers.ValidationError({'name': ["A project with this name already exists."]})
+            raise
     
+class ProjectMonthlySummarySerializer(serializers.ModelSerializer):
+    month = serializers.DateField(format='%Y-%m')
+
+    class Meta:
+        model = ProjectMonthlySummary
+        fields = [
+            'month', 'unit_count', 'occupied_units', 'active_tenancies',
+            'expected_rent', 'collected_rent', 'refreshed_at'
+        ]
+
+
+class ListingSearchResultSerializer(serializers.Serializer):
+    """Read-only shape of a row returned by ListingSearch."""
+    kind = serializers.CharField()
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    address = serializers.CharField()
+    project_id = serializers.UUIDField()
+    project_name = serializers.CharField()
+    rank = serializers.FloatField()
+
+
+class PropertyUnitImageSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PropertyUnitImage
+        fields = ['id', 'image', 'variants', 'uploaded_at']
+        read_only_fields = ('uploaded_at',)
+
+    def get_variants(self, obj):
+        return variant_urls(obj.image, obj.variants)
+
+
 class TenantProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = TenantProfile
@@ -35,6 +98,7 @@ class TenantProfileSerializer(serializers.ModelSerializer):
 class PropertyUnitSerializer(serializers.ModelSerializer):
     property_project_name = serializers.CharField(source='property_project.name', read_only=True)
     tenant_info = serializers.SerializerMethodField()
+    gallery = PropertyUnitImageSerializer(many=True, read_only=True)
 
     class Meta:
         model = PropertyUnit
@@ -43,16 +107,46 @@ class PropertyUnitSerializer(serializers.ModelSerializer):
             'property_project_name', 'unit_name',
             'unit_type', 'purpose', 'price',
             'amenities', 'created_at',
-            'tenant_info'
+            'tenant_info', 'gallery'
         ]
         read_only_fields = ('created_at', 'paid_days')
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the project, gallery and active tenant profile for every unit in a fixed number of queries."""
+        return queryset.select_related('property_project').prefetch_related(
+            *PropertyUnitSerializer.eager_prefetches()
+        )
+
+    @staticmethod
+    def eager_prefetches(prefix=''):
+        """The prefetches of setup_eager_loading, for units reached through `prefix` (e.g. 'property_unit__')."""
+        return [
+            Prefetch(f'{prefix}gallery', queryset=PropertyUnitImage.objects.order_by('uploaded_at')),
+            Prefetch(
+                f'{prefix}tenancies',
+                queryset=Tenancy.objects.filter(active=True)
+                .select_related('tenant__tenantprofile')
+                .order_by('pk'),
+                to_attr='active_tenancies'
+            ),
+        ]
+
     def get_tenant_info(self, obj):
-        tenancy = Tenancy.objects.filter(property_unit=obj, active=True).first()
-        if tenancy:
-            tenant_profile = TenantProfile.objects.filter(user=tenancy.tenant).first()
-            return TenantProfileSerializer(tenant_profile).data if tenant_profile else None
-        return None
+        if hasattr(obj, 'active_tenancies'):
+            tenancy = obj.active_tenancies[0] if obj.active_tenancies else None
+            if tenancy is None:
+                return None
+            try:
+                tenant_profile = tenancy.tenant.tenantprofile
+            except ObjectDoesNotExist:
+                tenant_profile = None
+        else:
+            tenancy = Tenancy.objects.filter(property_unit=obj, active=True).first()
+            if not tenancy:
+                return None
+            tenant_profile = TenantProfile.objects.filter(user=tenancy.tenant_id).first()
+        return TenantProfileSerializer(tenant_profile).data if tenant_profile else None
 
 
 
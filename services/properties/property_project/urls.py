@@ -2,18 +2,30 @@ from django.urls import path
 from .views import (
     PropertyProjectListAPIView,
     PropertyProjectDetailAPIView,
+    PropertyProjectSummaryAPIView,
     PropertyUnitListAPIView,
     PropertyUnitCreateAPIView,
-    PropertyUnitDetailAPIView
+    PropertyUnitDetailAPIView,
+    PropertyUnitGalleryUploadAPIView,
+    PropertyUnitImportAPIView,
+    PropertyUnitExportAPIView,
+    ListingSearchAPIView
 )
 
 urlpatterns = [
     # Project URLs
     path('projects/', PropertyProjectListAPIView.as_view(), name='project-list'),
     path('projects/<uuid:pk>/', PropertyProjectDetailAPIView.as_view(), name='project-detail'),
+    path('projects/<uuid:pk>/summary/', PropertyProjectSummaryAPIView.as_view(), name='project-summary'),
     
     # Unit URLs
     path('units/', PropertyUnitListAPIView.as_view(), name='unit-list'),
     path('units/create', PropertyUnitCreateAPIView.as_view(), name='unit-create'),
+    path('units/export.<str:export_format>', PropertyUnitExportAPIView.as_view(), name='unit-export'),
+    path('units/import/', PropertyUnitImportAPIView.as_view(), name='unit-import'),
     path('units/<uuid:pk>/', PropertyUnitDetailAPIView.as_view(), name='unit-detail'),
+    path('units/<uuid:pk>/gallery/', PropertyUnitGalleryUploadAPIView.as_view(), name='unit-gallery-upload'),
+
+    # Search
+    path('search/', ListingSearchAPIView.as_view(), name='listing-search'),
 ]
\ No newline at end of file
@@ -1,31 +1,69 @@
+from django import forms
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
 from django.http import Http404
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from core.models import PropertyProject, PropertyUnit
-from .serializers import PropertyProjectSerializer, PropertyUnitSerializer
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.exceptions import ValidationError
+import os
+import uuid
+from datetime import datetime
+from django.utils import timezone
+from core.exports import export_response
+from core.conditional import conditional_get, object_validators, version_validators
+from core.images import schedule_variants
+from core.response_cache import ALL_PROJECTS, bump_project_versions, cached_response_data, project_scope
+from core.models import PropertyProject, PropertyUnit, PropertyUnitImage, ProjectMonthlySummary
+from core.rollups import add_months, compute_project_months, current_month, month_count
+from .serializers import (
+    PropertyProjectSerializer,
+    PropertyUnitSerializer,
+    PropertyUnitImageSerializer,
+    ListingSearchResultSerializer,
+    ProjectMonthlySummarySerializer
+)
+from .filters import PropertyUnitFilter
+from .search import ListingSearch
+from .imports import UnitImporter, UnitImportError
+from core.pagination import StandardPagination, KeysetPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
 
 
 
 
-class StandardPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+class PaginatedListMixin:
+    """Page-number pagination by default, keyset pagination when a cursor is sent."""
+    pagination_class = StandardPagination
+    cursor_pagination_class = KeysetPagination
+
+    def get_paginator(self, request):
+        if self.cursor_pagination_class.requested(request):
+            return self.cursor_pagination_class()
+        return self.pagination_class()
 
 
 # PropertyProject Views
-class PropertyProjectListAPIView(APIView):
-    pagination_class = StandardPagination
+class PropertyProjectListAPIView(PaginatedListMixin, APIView):
     # permission_classes = [IsAuthenticatedOrReadOnly]
-    
+
+    def get_queryset(self):
+        return PropertyProject.objects.all().order_by('name', 'id')
+
+    def get_validators(self, request):
+        return version_validators(request, [ALL_PROJECTS])
+
+    @conditional_get
     def get(self, request):
-        projects = PropertyProject.objects.all().order_by('name')
+        return Response(cached_response_data(request, [ALL_PROJECTS], lambda: self.build_data(request)))
+
+    def build_data(self, request):
+        projects = self.get_queryset()
         
         # Step 1: Instantiate the paginator
-        paginator = self.pagination_class()
+        paginator = self.get_paginator(request)
         
         # Step 2: Paginate the queryset
         page = paginator.paginate_queryset(projects, request)
@@ -34,7 +72,7 @@ class PropertyProjectListAPIView(APIView):
         serializer = PropertyProjectSerializer(page, many=True)
         
         # Step 4: Use the SAME paginator instance to get paginated response
-        return paginator.get_paginated_response(serializer.data)
+        return paginator.get_paginated_response(serializer.data).data
 
     def post(self, request):
         serializer = PropertyProjectSerializer(data=request.data)
@@ -52,10 +90,14 @@ class PropertyProjectDetailAPIView(APIView):
         except PropertyProject.DoesNotExist:
             raise Http404
 
+    def get_validators(self, request, pk):
+        return object_validators(PropertyProject.objects.all(), pk, 'updated_at')
+
+    @conditional_get
     def get(self, request, pk):
-        project = self.get_object(pk)
-        serializer = PropertyProjectSerializer(project)
-        return Response(serializer.data)
+        def build():
+            return PropertyProjectSerializer(self.get_object(pk)).data
+        return Response(cached_response_data(request, [project_scope(pk)], build))
 
     def put(self, request, pk):
         project = self.get_object(pk)
@@ -71,17 +113,99 @@ class PropertyProjectDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class PropertyUnitListAPIView(APIView):
-    pagination_class = StandardPagination
+class PropertyProjectSummaryAPIView(APIView):
+    """Monthly occupancy and revenue of a project, read from ProjectMonthlySummary"""
+    default_months = 12
+    max_months = default_months * 5
 
+    def parse_month(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m').date()
+        except ValueError:
+            raise ValidationError({param: ['Month must be in YYYY-MM format.']})
+
+    def get(self, request, pk):
+        if not PropertyProject.objects.filter(pk=pk).exists():
+            raise Http404
+
+        # Future months have nothing to summarise yet and would never be refreshed.
+        last = min(self.parse_month(request, 'to') or current_month(), current_month())
+        first = self.parse_month(request, 'from') or add_months(last, 1 - self.default_months)
+        if first > last:
+            raise ValidationError({'from': ['Must not be after "to" or the current month.']})
+        if month_count(first, last) > self.max_months:
+            raise ValidationError({'from': [f'At most {self.max_months} months can be requested at once.']})
+
+        summaries = list(ProjectMonthlySummary.objects.filter(
+            property_project_id=pk, month__gte=first, month__lte=last
+        ).order_by('month'))
+        if len(summaries) < month_count(first, last):
+            # Months nothing has touched yet (e.g. a new month) are computed on
+            # the fly, not stored: a GET never writes, and the signals and
+            # rebuild_project_summaries own the stored rows.
+            stored = {summary.month: summary for summary in summaries}
+            summaries = [
+                stored.get(summary.month, summary) for summary in compute_project_months(pk, first, last)
+            ]
+
+        serializer = ProjectMonthlySummarySerializer(summaries, many=True)
+        return Response(serializer.data)
+
+
+class PropertyUnitListAPIView(PaginatedListMixin, APIView):
+
+    def get_queryset(self, request):
+        return PropertyUnitFilter(request.query_params).filter_queryset(PropertyUnit.objects.all())
+
+    def get_validators(self, request):
+        return version_validators(request, [self.get_cache_scope(request)])
+
+    def get_cache_scope(self, request):
+        """Lists filtered to one project only depend on that project's version."""
+        try:
+            return project_scope(uuid.UUID(request.query_params['property_project']))
+        except (KeyError, ValueError):
+            return ALL_PROJECTS
+
+    @conditional_get
     def get(self, request):
-        units = PropertyUnit.objects.select_related('property_project').order_by('property_project__name', 'unit_name')
+        scope = self.get_cache_scope(request)
+        return Response(cached_response_data(request, [scope], lambda: self.build_data(request)))
+
+    def build_data(self, request):
+        units = PropertyUnitSerializer.setup_eager_loading(self.get_queryset(request))
         
-        paginator = self.pagination_class()
+        paginator = self.get_paginator(request)
         page = paginator.paginate_queryset(units, request)
         serializer = PropertyUnitSerializer(page, many=True)
         
-        return paginator.get_paginated_response(serializer.data)
+        return paginator.get_paginated_response(serializer.data).data
+
+
+class PropertyUnitExportAPIView(APIView):
+    """Stream every unit matching the unit list filters as CSV or NDJSON"""
+    permission_classes = [IsAdminUser]
+    fields = [
+        ('id', 'id'),
+        ('property_project', 'property_project_id'),
+        ('property_project_name', 'property_project__name'),
+        ('unit_name', 'unit_name'),
+        ('unit_type', 'unit_type'),
+        ('purpose', 'purpose'),
+        ('price', 'price'),
+        ('is_listed_for_rent', 'is_listed_for_rent'),
+        ('is_listed_for_sale', 'is_listed_for_sale'),
+        ('amenities', 'amenities'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
+
+    def get(self, request, export_format):
+        units = PropertyUnitFilter(request.query_params).filter_queryset(PropertyUnit.objects.all())
+        return export_response(units, self.fields, export_format, 'units')
 
 
 class PropertyUnitCreateAPIView(APIView):
@@ -98,14 +222,22 @@ class PropertyUnitDetailAPIView(APIView):
     """Handles GET, PUT, DELETE for single unit"""
     def get_object(self, pk):
         try:
-            return PropertyUnit.objects.get(pk=pk)
+            return PropertyUnitSerializer.setup_eager_loading(PropertyUnit.objects.all()).get(pk=pk)
         except PropertyUnit.DoesNotExist:
             raise Http404
 
+    def get_validators(self, request, pk):
+        return object_validators(PropertyUnit.objects.all(), pk, 'updated_at')
+
+    @conditional_get
     def get(self, request, pk):
-        unit = self.get_object(pk)
-        serializer = PropertyUnitSerializer(unit)
-        return Response(serializer.data)
+        project_id = PropertyUnit.objects.filter(pk=pk).values_list('property_project_id', flat=True).first()
+        if project_id is None:
+            raise Http404
+
+        def build():
+            return PropertyUnitSerializer(self.get_object(pk)).data
+        return Response(cached_response_data(request, [project_scope(project_id)], build))
 
     def put(self, request, pk):
         unit = self.get_object(pk)
@@ -118,4 +250,127 @@ class PropertyUnitDetailAPIView(APIView):
     def delete(self, request, pk):
         unit = self.get_object(pk)
         unit.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PropertyUnitGalleryUploadAPIView(APIView):
+    """
+    Upload many gallery images for a unit in one multipart request (field
+    `images`). Every upload is spooled to a temporary file in chunks instead
+    of memory, moved into storage, and all rows are inserted with a single
+    bulk_create.
+    """
+    parser_classes = [MultiPartParser]
+    file_field = 'images'
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Must be set before the body is parsed.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def post(self, request, pk):
+        if not PropertyUnit.objects.filter(pk=pk).exists():
+            raise Http404
+
+        uploads = request.FILES.getlist(self.file_field)
+        if not uploads:
+            return Response({self.file_field: ['No files were submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        image_field = forms.ImageField()
+        errors = {}
+        for index, upload in enumerate(uploads):
+            try:
+                image_field.clean(upload)
+            except DjangoValidationError as error:
+                errors[index] = error.messages
+        if errors:
+            return Response({self.file_field: errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        model_field = PropertyUnitImage._meta.get_field('image')
+        images = []
+        try:
+            for upload in uploads:
+                image = PropertyUnitImage(property_unit_id=pk)
+                name = model_field.generate_filename(image, upload.name)
+                image.image = model_field.storage.save(name, upload, max_length=model_field.max_length)
+                images.append(image)
+            with transaction.atomic():
+                images = PropertyUnitImage.objects.bulk_create(images)
+                for image in images:
+                    schedule_variants(image)
+                # bulk_create sends no signals: touch the unit so its conditional GET
+                # validators (core.conditional) and cached responses change.
+                PropertyUnit.objects.filter(pk=pk).update(updated_at=timezone.now())
+                bump_project_versions(
+                    PropertyUnit.objects.filter(pk=pk).values_list('property_project_id', flat=True).first()
+                )
+        except Exception as error:
+            for image in images:
+                model_field.storage.delete(image.image.name)
+            if not isinstance(error, IntegrityError):
+                raise
+            return Response(
+                {self.file_field: ['One or more images already exist for this unit.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = PropertyUnitImageSerializer(images, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class PropertyUnitImportAPIView(APIView):
+    """
+    Bulk import units from an uploaded CSV or JSON file (multipart field
+    `file`) or a JSON list in the request body. All rows are validated with
+    the PropertyUnitSerializer rules and inserted in one transaction;
+    nothing is inserted if any row is invalid.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+    file_field = 'file'
+    formats = {'.csv': 'csv', '.json': 'json'}
+
+    def get_importer(self, request):
+        if isinstance(request.data, list):
+            return UnitImporter(request.data)
+        upload = request.FILES.get(self.file_field)
+        if upload is None:
+            raise ValidationError({self.file_field: ['No file was submitted.']})
+        extension = os.path.splitext(upload.name)[1].lower()
+        if extension not in self.formats:
+            raise ValidationError({self.file_field: ['Only .csv and .json files can be imported.']})
+        try:
+            return UnitImporter.from_file(upload, self.formats[extension])
+        except UnitImportError as error:
+            raise ValidationError({self.file_field: [str(error)]})
+
+    def post(self, request):
+        importer = self.get_importer(request)
+        units = importer.run()
+        if units is None:
+            return Response({'errors': importer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'created': len(units)}, status=status.HTTP_201_CREATED)
+
+
+class ListingSearchAPIView(APIView):
+    """Ranked full-text and fuzzy search over projects and units"""
+    pagination_class = StandardPagination
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({'q': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        kind = request.query_params.get('type')
+        if kind and kind not in ListingSearch.kinds:
+            return Response(
+                {'type': [f"Type must be one of: {', '.join(ListingSearch.kinds)}."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = ListingSearch(text, kinds=[kind] if kind else None).get_queryset()
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(results, request)
+        serializer = ListingSearchResultSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
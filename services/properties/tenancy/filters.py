@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from core.filters import QueryParamFilter
+
+
+class TenancyFilter(QueryParamFilter):
+    """Translates tenancy list query params (unit, project, tenant, active, ordering) into queryset filters."""
+    default_ordering = ('-created_at', '-id')
+    ordering_fields = ('created_at', 'tenancy_start_date', 'tenancy_end_date')
+
+    def filter_queryset(self, queryset):
+        filters = {}
+
+        property_unit = self.get_uuid('property_unit')
+        if property_unit is not None:
+            filters['property_unit_id'] = property_unit
+        property_project = self.get_uuid('property_project')
+        if property_project is not None:
+            filters['property_unit__property_project_id'] = property_project
+        tenant = self.get_uuid('tenant')
+        if tenant is not None:
+            filters['tenant_id'] = tenant
+        active = self.get_boolean('active')
+        if active is not None:
+            filters['active'] = active
+
+        ordering = self.get_ordering()
+
+        if self.errors:
+            raise serializers.ValidationError(self.errors)
+
+        return queryset.filter(**filters).order_by(*ordering)
@@ -1,8 +1,16 @@
 from rest_framework import serializers
 from rest_framework.serializers import SerializerMethodField
+from core.constraints import constraint_errors
 from core.models import Tenancy  # Adjust import path if necessary
 from property_project.serializers import PropertyUnitSerializer
 
+OVERLAP_ERRORS = {
+    'tenancy_no_overlap': {
+        'tenancy_start_date': ["This unit already has an active tenancy overlapping these dates."]
+    },
+}
+
+
 class TenancySerializer(serializers.ModelSerializer):
 
     def get_tenant_serializer(self):
@@ -22,23 +30,44 @@ class TenancySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load each tenancy's unit and tenant with everything their serializers embed, in a fixed number of queries."""
+        from user.serializers import UserSerializer
+        return queryset.select_related('tenant', 'property_unit__property_project').prefetch_related(
+            *PropertyUnitSerializer.eager_prefetches('property_unit__'),
+            *UserSerializer.eager_prefetches('tenant__'),
+        )
+
     def get_tenant(self, obj):
         serializer_class = self.get_tenant_serializer()
         return serializer_class(obj.tenant).data if obj.tenant else None
     
+    def validate(self, data):
+        start = data.get('tenancy_start_date', getattr(self.instance, 'tenancy_start_date', None))
+        end = data.get('tenancy_end_date', getattr(self.instance, 'tenancy_end_date', None))
+        if start and end and end < start:
+            raise serializers.ValidationError({
+                'tenancy_end_date': ["Tenancy end date cannot be before the start date."]
+            })
+        return data
+
     def create(self, validated_data):
         tenant_id = validated_data.pop('tenant_id')
         property_unit_id = validated_data.pop('property_unit_id')
 
-        tenancy = Tenancy.objects.create(
-            tenant_id=tenant_id,
-            property_unit_id=property_unit_id,
-            **validated_data
-        )
+        # Overlaps are rejected by the tenancy_no_overlap exclusion constraint.
+        with constraint_errors(OVERLAP_ERRORS):
+            tenancy = Tenancy.objects.create(
+                tenant_id=tenant_id,
+                property_unit_id=property_unit_id,
+                **validated_data
+            )
         return tenancy
 
     def update(self, instance, validated_data):
         # Optional: support updating tenant and property_unit if needed
         validated_data.pop('tenant', None)
         validated_data.pop('property_unit', None)
-        return super().update(instance, validated_data)
+        with constraint_errors(OVERLAP_ERRORS):
+            return super().update(instance, validated_data)
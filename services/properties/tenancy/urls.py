@@ -1,7 +1,18 @@
 from django.urls import path
-from .views import TenancyListCreateAPIView, TenancyDetailAPIView
+from .views import (
+    TenancyListCreateAPIView,
+    TenancyDetailAPIView,
+    TenancyExportAPIView,
+    RentTransactionExportAPIView,
+)
 
 urlpatterns = [
     path('', TenancyListCreateAPIView.as_view(), name='tenancy-list-create'),
+    path('export.<str:export_format>', TenancyExportAPIView.as_view(), name='tenancy-export'),
+    path(
+        'transactions/export.<str:export_format>',
+        RentTransactionExportAPIView.as_view(),
+        name='rent-transaction-export'
+    ),
     path('<uuid:pk>/', TenancyDetailAPIView.as_view(), name='tenancy-detail'),
 ]
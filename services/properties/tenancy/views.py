@@ -3,18 +3,38 @@ from django.shortcuts import render
 # Create your views here.
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from rest_framework import status
-from core.models import Tenancy
+from core.models import RentTransaction, Tenancy
 from .serializers import TenancySerializer
+from .filters import TenancyFilter
+from core.pagination import StandardPagination
 from django.shortcuts import get_object_or_404
+from core.conditional import conditional_get, object_validators
+from core.exports import export_response
+from rest_framework.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+
+# Tenancies embed their unit and tenant, whose timestamps are bumped when
+# anything they embed changes.
+VALIDATOR_FIELDS = ('updated_at', 'property_unit__updated_at', 'tenant__updated_at')
 
 class TenancyListCreateAPIView(APIView):
     """List all tenancies or create a new one."""
-    
+
+    pagination_class = StandardPagination
+    etag_from_content = True
+
+    def get_queryset(self, request):
+        return TenancyFilter(request.query_params).filter_queryset(Tenancy.objects.all())
+
+    @conditional_get
     def get(self, request):
-        tenancies = Tenancy.objects.select_related('tenant', 'property_unit').all()
-        serializer = TenancySerializer(tenancies, many=True)
-        return Response(serializer.data)
+        tenancies = TenancySerializer.setup_eager_loading(self.get_queryset(request))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tenancies, request)
+        serializer = TenancySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = TenancySerializer(data=request.data)
@@ -30,6 +50,10 @@ class TenancyDetailAPIView(APIView):
     def get_object(self, pk):
         return get_object_or_404(Tenancy, pk=pk)
 
+    def get_validators(self, request, pk):
+        return object_validators(Tenancy.objects.all(), pk, *VALIDATOR_FIELDS)
+
+    @conditional_get
     def get(self, request, pk):
         tenancy = self.get_object(pk)
         serializer = TenancySerializer(tenancy)
@@ -47,3 +71,72 @@ class TenancyDetailAPIView(APIView):
         tenancy = self.get_object(pk)
         tenancy.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TenancyExportAPIView(APIView):
+    """Stream all tenancies as CSV or NDJSON, in table order."""
+    permission_classes = [IsAdminUser]
+    fields = [
+        ('id', 'id'),
+        ('property_unit', 'property_unit_id'),
+        ('unit_name', 'property_unit__unit_name'),
+        ('property_project', 'property_unit__property_project_id'),
+        ('tenant', 'tenant_id'),
+        ('tenant_email', 'tenant__email'),
+        ('tenancy_start_date', 'tenancy_start_date'),
+        ('tenancy_end_date', 'tenancy_end_date'),
+        ('monthly_rent', 'monthly_rent'),
+        ('deposit_amount', 'deposit_amount'),
+        ('payment_due_date', 'payment_due_date'),
+        ('active', 'active'),
+        ('created_at', 'created_at'),
+    ]
+
+    def get(self, request, export_format):
+        return export_response(Tenancy.objects.order_by(), self.fields, export_format, 'tenancies')
+
+
+class RentTransactionExportAPIView(APIView):
+    """
+    Stream rent transactions as CSV or NDJSON, in table order. `from` and
+    `to` (YYYY-MM-DD, inclusive) limit the transaction dates.
+    """
+    permission_classes = [IsAdminUser]
+    fields = [
+        ('id', 'id'),
+        ('tenancy', 'tenancy_id'),
+        ('property_unit', 'tenancy__property_unit_id'),
+        ('unit_name', 'tenancy__property_unit__unit_name'),
+        ('tenant_email', 'tenancy__tenant__email'),
+        ('transaction_date', 'transaction_date'),
+        ('amount', 'amount'),
+        ('payment_method', 'payment_method'),
+        ('payment_status', 'payment_status'),
+        ('rent_period_start_date', 'rent_period_start_date'),
+        ('rent_period_end_date', 'rent_period_end_date'),
+        ('paid_days', 'paid_days'),
+        ('receipt_number', 'receipt_number'),
+        ('description', 'description'),
+    ]
+
+    def get_date(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({param: ['Enter a valid date (YYYY-MM-DD).']})
+        return parsed
+
+    def get(self, request, export_format):
+        transactions = RentTransaction.objects.order_by()
+        first = self.get_date(request, 'from')
+        if first:
+            transactions = transactions.filter(transaction_date__date__gte=first)
+        last = self.get_date(request, 'to')
+        if last:
+            transactions = transactions.filter(transaction_date__date__lte=last)
+        return export_response(transactions, self.fields, export_format, 'rent-transactions')
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from core.models import Role, User
+from core.roles import get_role
+from .serializers import UserRegistrationSerializer
+
+
+_executor = None
+
+UNIQUE_FIELDS = ('email', 'national_id', 'passport_number')
+
+
+class TenantImportSerializer(UserRegistrationSerializer):
+    """UserRegistrationSerializer rules without the per-row queries; uniqueness is checked per batch."""
+    role = None
+
+    class Meta(UserRegistrationSerializer.Meta):
+        fields = [field for field in UserRegistrationSerializer.Meta.fields if field != 'role']
+        extra_kwargs = {
+            **UserRegistrationSerializer.Meta.extra_kwargs,
+            **{
+                field: {**UserRegistrationSerializer.Meta.extra_kwargs.get(field, {}), 'validators': []}
+                for field in UNIQUE_FIELDS
+            },
+        }
+        validators = []
+
+    def validate_email(self, value):
+        return value.lower().strip()
+
+
+class TenantImportError(Exception):
+    pass
+
+
+def _setup_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'properties.settings')
+    import django
+    django.setup()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_setup_worker,
+        )
+    return _executor
+
+
+def hash_passwords(passwords):
+    """make_password() for every password, in the worker pool unless PASSWORD_HASH_WORKERS is 0."""
+    if not settings.PASSWORD_HASH_WORKERS or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (settings.PASSWORD_HASH_WORKERS * 4))
+    return list(get_executor().map(make_password, passwords, chunksize=chunksize))
+
+
+class TenantImporter:
+    """
+    Validates tenant rows with the registration rules, checks email,
+    national_id and passport_number uniqueness with one query per field and
+    batch, hashes passwords in a process pool and inserts users and their
+    tenant role links with bulk_create in one transaction. Nothing is
+    inserted if any row is invalid; errors are reported per row (1-based).
+    """
+    batch_size = 1000
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.errors = []
+        self.valid = []
+
+    @classmethod
+    def from_file(cls, file, file_format):
+        if file_format == 'json':
+            try:
+                rows = json.load(file)
+            except ValueError as error:
+                raise TenantImportError(f'Invalid JSON: {error}')
+            if not isinstance(rows, list):
+                raise TenantImportError('JSON import must be a list of tenant objects.')
+            return cls(rows)
+        if file_format == 'csv':
+            text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+            try:
+                return cls([
+                    {key: value for key, value in row.items() if key and value not in (None, '')}
+                    for row in csv.DictReader(text)
+                ])
+            except UnicodeDecodeError:
+                raise TenantImportError('CSV import must be UTF-8 encoded.')
+            except csv.Error as error:
+                raise TenantImportError(f'Invalid CSV: {error}')
+        raise TenantImportError(f'Unsupported import format "{file_format}".')
+
+    def add_error(self, row, field, message):
+        for error in self.errors:
+            if error['row'] == row:
+                error['errors'].setdefault(field, []).append(message)
+                return
+        self.errors.append({'row': row, 'errors': {field: [message]}})
+
+    def validate(self):
+        seen = {field: {} for field in UNIQUE_FIELDS}
+        for start in range(0, len(self.rows), self.batch_size):
+            batch = []
+            for offset, row in enumerate(self.rows[start:start + self.batch_size]):
+                number = start + offset + 1
+                serializer = TenantImportSerializer(data=row)
+                if not serializer.is_valid():
+                    self.errors.append({'row': number, 'errors': serializer.errors})
+                    continue
+                data = serializer.validated_data
+                duplicate = False
+                for field in UNIQUE_FIELDS:
+                    value = data.get(field)
+                    if not value:
+                        continue
+                    if value in seen[field]:
+                        self.add_error(number, field, f'Duplicate {field} in this import (row {seen[field][value]}).')
+                        duplicate = True
+                    else:
+                        seen[field][value] = number
+                if not duplicate:
+                    batch.append((number, data))
+            self.check_existing(batch)
+        self.errors.sort(key=lambda error: error['row'])
+        return not self.errors
+
+    def check_existing(self, batch):
+        """Reject rows whose unique values are already taken, with one query per field."""
+        taken = {}
+        emails = {data['email'] for _, data in batch if data.get('email')}
+        if emails:
+            taken['email'] = set(
+                User.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower__in=emails).values_list('email_lower', flat=True)
+            )
+        for field in ('national_id', 'passport_number'):
+            values = {data[field] for _, data in batch if data.get(field)}
+            if values:
+                taken[field] = set(User.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True))
+
+        for number, data in batch:
+            conflicts = [field for field, values in taken.items() if data.get(field) in values]
+            for field in conflicts:
+                label = field.replace('_', ' ')
+                self.add_error(number, field, f'A user with this {label} already exists.')
+            if not conflicts:
+                self.valid.append(data)
+
+    def save(self):
+        try:
+            tenant_role = get_role('tenant')
+        except Role.DoesNotExist:
+            raise TenantImportError("Default 'tenant' role does not exist.")
+
+        passwords = hash_passwords([data.get('password') for data in self.valid])
+        users = []
+        for data, password in zip(self.valid, passwords):
+            fields = {key: value for key, value in data.items() if key != 'password'}
+            users.append(User(password=password, **fields))
+
+        Link = User.roles.through
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create(users, batch_size=self.batch_size)
+                Link.objects.bulk_create(
+                    [Link(user_id=user.pk, role_id=tenant_role.pk) for user in users],
+                    batch_size=self.batch_size
+                )
+        except IntegrityError:
+            raise TenantImportError('Some users were created by another request during the import; retry it.')
+        return users
+
+    def run(self):
+        if not self.validate():
+            return None
+        return self.save()
@@ -1,15 +1,52 @@
+from contextlib import contextmanager
+
 from django.contrib.auth import (
     get_user_model,
     authenticate,
 )
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.db.models.functions import JSONObject
 from django.utils.translation import gettext as _
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import serializers
 from core.models import Role, Tenancy
+from core.roles import get_role, get_role_by_id
+from core.user_cache import bump_user_version
+from .throttling import hashing_slot
 from tenancy.serializers import TenancySerializer
 
 User = get_user_model()
 
+@contextmanager
+def email_conflicts_as_errors(email, instance=None):
+    """
+    Turn a unique_email_lower violation, from a user saved by a concurrent
+    request after validate_email passed, into a validation error. When
+    updating, `instance` is the user being saved, whose own row is no conflict.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError:
+        others = User.objects.filter_email(email) if email else User.objects.none()
+        if instance is not None:
+            others = others.exclude(pk=instance.pk)
+        if others.exists():
+            raise serializers.ValidationError({'email': ["A user with this email already exists."]})
+        raise
+
+
+class RoleRegistryField(serializers.PrimaryKeyRelatedField):
+    """Resolves role ids from the in-process role registry (core.roles) instead of one query per id."""
+
+    def to_internal_value(self, data):
+        try:
+            return get_role_by_id(data)
+        except Role.DoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+
+
 class RoleSerializer(serializers.ModelSerializer):
     """Serializer for Role model."""
     class Meta:
@@ -38,7 +75,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     tenancy = serializers.SerializerMethodField()
 
-    role_ids = serializers.PrimaryKeyRelatedField(
+    role_ids = RoleRegistryField(
         many=True,
         queryset=Role.objects.all(),
         source='roles',
@@ -83,6 +120,42 @@ class UserSerializer(serializers.ModelSerializer):
             }
         }
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load roles and the active tenancy for every user in a fixed number of queries."""
+        return queryset.prefetch_related(*UserSerializer.eager_prefetches())
+
+    @staticmethod
+    def eager_prefetches(prefix=''):
+        """The prefetches of setup_eager_loading, for users reached through `prefix` (e.g. 'tenant__')."""
+        return [
+            f'{prefix}roles',
+            Prefetch(
+                f'{prefix}tenancies',
+                queryset=Tenancy.objects.filter(active=True).select_related('property_unit').order_by('pk'),
+                to_attr='active_tenancies'
+            ),
+        ]
+
+    @staticmethod
+    def setup_profile_loading(queryset):
+        """
+        Load single users with their project in one joined query, the active
+        tenancy as a JSON subquery of that same query, and their roles in
+        one prefetch.
+        """
+        active_tenancy = Tenancy.objects.filter(tenant=OuterRef('pk'), active=True).order_by('pk').values(
+            data=JSONObject(
+                property_unit_id='property_unit_id',
+                property_unit_name='property_unit__unit_name',
+                tenancy_start_date='tenancy_start_date',
+                tenancy_end_date='tenancy_end_date',
+            )
+        )[:1]
+        return queryset.select_related('property_project').prefetch_related('roles').annotate(
+            active_tenancy=Subquery(active_tenancy)
+        )
+
     def get_full_name(self, obj):
         """Return the user's full name."""
         return f"{obj.first_name} {obj.last_name}".strip()
@@ -90,7 +163,7 @@ class UserSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
         """Validate that email is unique and properly formatted."""
         value = value.lower().strip()
-        if User.objects.filter(email__iexact=value).exists():
+        if User.objects.filter_email(value).exists():
             if self.instance and self.instance.email == value:
                 return value
             raise serializers.ValidationError("A user with this email already exists.")
@@ -119,7 +192,7 @@ class UserSerializer(serializers.ModelSerializer):
         if not value:
             # Default to 'tenant' role if no roles specified
             try:
-                tenant_role = Role.objects.get(name='tenant')
+                tenant_role = get_role('tenant')
                 return [tenant_role]
             except Role.DoesNotExist:
                 raise serializers.ValidationError("Default 'tenant' role does not exist.")
@@ -140,12 +213,13 @@ class UserSerializer(serializers.ModelSerializer):
         # If no roles provided, default to 'tenant'
         if not roles_data:
             try:
-                tenant_role = Role.objects.get(name='tenant')
+                tenant_role = get_role('tenant')
                 roles_data = [tenant_role]
             except Role.DoesNotExist:
                 raise serializers.ValidationError("Default 'tenant' role does not exist.")
         
-        user = User.objects.create_user(**validated_data)
+        with email_conflicts_as_errors(validated_data.get('email')):
+            user = User.objects.create_user(**validated_data)
         user.roles.set(roles_data)
         return user
 
@@ -154,7 +228,8 @@ class UserSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password', None)
         roles_data = validated_data.pop('roles', None)
         
-        user = super().update(instance, validated_data)
+        with email_conflicts_as_errors(validated_data.get('email'), instance):
+            user = super().update(instance, validated_data)
         
         if password:
             user.set_password(password)
@@ -169,10 +244,19 @@ class UserSerializer(serializers.ModelSerializer):
         """Deactivate rather than delete users (common practice)."""
         instance.is_active = False
         instance.save()
+        # Also bumped by the post_save handler; explicit so that deactivation
+        # never depends on signal wiring.
+        bump_user_version(instance.pk)
         return instance
     
     def get_tenancy(self, obj):
-        tenancy = Tenancy.objects.filter(tenant=obj, active=True).select_related('property_unit').first()
+        if hasattr(obj, 'active_tenancy'):
+            # Already in UserTenancySerializer's shape, see setup_profile_loading.
+            return obj.active_tenancy
+        if hasattr(obj, 'active_tenancies'):
+            tenancy = obj.active_tenancies[0] if obj.active_tenancies else None
+        else:
+            tenancy = Tenancy.objects.filter(tenant=obj, active=True).select_related('property_unit').first()
         if tenancy:
             return UserTenancySerializer(tenancy).data
         return None
@@ -214,7 +298,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
         """Validate that email is unique and properly formatted."""
         value = value.lower().strip()
-        if User.objects.filter(email__iexact=value).exists():
+        if User.objects.filter_email(value).exists():
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
@@ -239,7 +323,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def validate_role(self, value):
         """Validate that the role exists."""
         try:
-            Role.objects.get(name=value)
+            get_role(value)
             return value
         except Role.DoesNotExist:
             raise serializers.ValidationError(f"Role '{value}' does not exist.")
@@ -256,11 +340,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         """Create and return a new user with encrypted password and role."""
         role_name = validated_data.pop('role', 'tenant')
         
-        user = User.objects.create_user(**validated_data)
+        with email_conflicts_as_errors(validated_data.get('email')):
+            user = User.objects.create_user(**validated_data)
         
         # Assign role
         try:
-            role = Role.objects.get(name=role_name)
+            role = get_role(role_name)
             user.roles.add(role)
         except Role.DoesNotExist:
             # If role doesn't exist, still create user but without role
@@ -277,11 +362,12 @@ class AuthTokenSerializer(TokenObtainPairSerializer):
         email = attrs.get('email').lower().strip()
         password = attrs.get('password')
 
-        user = authenticate(
-            request=self.context.get('request'),
-            username=email,
-            password=password
-        )
+        with hashing_slot():
+            user = authenticate(
+                request=self.context.get('request'),
+                username=email,
+                password=password
+            )
 
         if not user:
             raise serializers.ValidationError(
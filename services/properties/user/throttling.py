@@ -0,0 +1,87 @@
+"""
+Protection of the password hashing path used by login.
+
+* LoginIPRateThrottle / LoginEmailRateThrottle reject attempts from the
+  shared cache before the view runs, so no hash is computed for them.
+* hashing_slot() bounds how many password hashes one worker computes at
+  once; attempts that cannot get a slot within LOGIN_HASH_WAIT seconds are
+  rejected instead of queueing.
+* Rejections and the CPU time spent hashing are counted in the shared cache
+  (see login_metrics()).
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+
+
+METRICS = ('rejected_ip', 'rejected_email', 'rejected_busy', 'hashes', 'hash_cpu_ms')
+
+_hash_slots = threading.BoundedSemaphore(settings.LOGIN_HASH_CONCURRENCY)
+
+
+def metric_key(name):
+    return f'metrics:login:{name}'
+
+
+def record(name, amount=1):
+    key = metric_key(name)
+    if not cache.add(key, amount, timeout=None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
+
+
+def login_metrics():
+    values = cache.get_many([metric_key(name) for name in METRICS])
+    return {name: values.get(metric_key(name), 0) for name in METRICS}
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    metric = None
+
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        if not allowed:
+            record(self.metric)
+        return allowed
+
+
+class LoginIPRateThrottle(LoginRateThrottle):
+    scope = 'login_ip'
+    metric = 'rejected_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailRateThrottle(LoginRateThrottle):
+    scope = 'login_email'
+    metric = 'rejected_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None  # Nothing to key on; the serializer rejects it without hashing.
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
+
+
+@contextmanager
+def hashing_slot():
+    """Hold one of this worker's password hashing slots and record the CPU time spent in it."""
+    if not _hash_slots.acquire(timeout=settings.LOGIN_HASH_WAIT):
+        record('rejected_busy')
+        raise Throttled(wait=1, detail='Too many login attempts in progress, please retry.')
+    started = time.thread_time()
+    try:
+        yield
+    finally:
+        elapsed = time.thread_time() - started
+        _hash_slots.release()
+        record('hashes')
+        record('hash_cpu_ms', round(elapsed * 1000))
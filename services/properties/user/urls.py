@@ -7,14 +7,18 @@ from .views import (
    UsersByRoleAPIView,
    CreateTokenView,
    UserRegistrationAPIView,
-   LoggedInUserAPIView
+   LoggedInUserAPIView,
+   LoginMetricsAPIView,
+   TenantImportAPIView
 )
 
 urlpatterns = [
     path('', UserListAPIView.as_view(), name='user-list'),
     path('tenants/', TenantListAPIView.as_view(), name='tenant-list'),
+    path('tenants/import/', TenantImportAPIView.as_view(), name='tenant-import'),
     path('register/', UserRegistrationAPIView.as_view(), name='user-register'),
     path('login/', CreateTokenView.as_view(), name='user-login'),
+    path('login/metrics/', LoginMetricsAPIView.as_view(), name='login-metrics'),
     path('logged-in-user/', LoggedInUserAPIView.as_view(), name='logged-in-user'), 
     path('me/', UserProfileAPIView.as_view(), name='my-profile'),
     path('role/<str:role_name>/', UsersByRoleAPIView.as_view(), name='users-by-role'),
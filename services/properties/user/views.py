@@ -1,3 +1,5 @@
+import os
+
 from django.contrib.auth import get_user_model
 from django.http import Http404
 from rest_framework import status
@@ -7,10 +9,17 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.settings import api_settings
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 
 from .serializers import UserSerializer, AuthTokenSerializer, UserRegistrationSerializer
+from .imports import TenantImporter, TenantImportError
+from .throttling import LoginEmailRateThrottle, LoginIPRateThrottle, login_metrics
+from core.authentication import ClaimsRefreshToken, ROLES_CLAIM
 from core.models import Role
+from core.roles import get_role
+from core.user_cache import cached_user_payload
+from core.pagination import StandardPagination
 
 User = get_user_model()
 
@@ -18,6 +27,7 @@ User = get_user_model()
 class UserListAPIView(APIView):
     """Handles GET (list all users) and POST (create new user)"""
     # permission_classes = [IsAdminUser]  # Only admin can list all users
+    pagination_class = StandardPagination
 
     def get(self, request):
         # Filter by role if provided in query params
@@ -27,9 +37,12 @@ class UserListAPIView(APIView):
             users = User.objects.filter(roles__name=role_filter)
         else:
             users = User.objects.all()
-        
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        users = UserSerializer.setup_eager_loading(users.order_by('email', 'id'))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(users, request)
+        serializer = UserSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = UserSerializer(data=request.data)
@@ -40,35 +53,79 @@ class UserListAPIView(APIView):
 
 class LoggedInUserAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    requires_user_model = True
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        return Response(cached_user_payload(request.user.pk, 'logged-in-user', lambda: self.build_data(request)))
+
+    def build_data(self, request):
+        user = UserSerializer.setup_profile_loading(User.objects.all()).get(pk=request.user.pk)
+        serializer = UserSerializer(user)
 
         # Get the property project details
         property_project = None
-        if request.user.property_project:
+        if user.property_project:
             property_project = {
-                'id': str(request.user.property_project.id),
-                'name': request.user.property_project.name
+                'id': str(user.property_project.id),
+                'name': user.property_project.name
             }
     
-        return Response({
+        return {
             'user': serializer.data,
             'property_project': property_project
-        })
+        }
 
 
 
 class TenantListAPIView(APIView):
     """Handles GET for listing only tenant users"""
     # permission_classes = [IsAdminUser]
+    pagination_class = StandardPagination
 
     def get(self, request):
-        tenants = User.objects.filter(roles__name='tenant').prefetch_related(
-            'tenancies__property_unit__property_project'
+        tenants = UserSerializer.setup_eager_loading(
+            User.objects.filter(roles__name='tenant').order_by('email', 'id')
         )
-        serializer = UserSerializer(tenants, many=True)
-        return Response(serializer.data)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tenants, request)
+        serializer = UserSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class TenantImportAPIView(APIView):
+    """
+    Bulk register tenants from an uploaded CSV or JSON file (multipart field
+    `file`) or a JSON list in the request body. Nothing is created if any
+    row is invalid.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+    file_field = 'file'
+    formats = {'.csv': 'csv', '.json': 'json'}
+
+    def get_importer(self, request):
+        if isinstance(request.data, list):
+            return TenantImporter(request.data)
+        upload = request.FILES.get(self.file_field)
+        if upload is None:
+            raise ValidationError({self.file_field: ['No file was submitted.']})
+        extension = os.path.splitext(upload.name)[1].lower()
+        if extension not in self.formats:
+            raise ValidationError({self.file_field: ['Only .csv and .json files can be imported.']})
+        try:
+            return TenantImporter.from_file(upload, self.formats[extension])
+        except TenantImportError as error:
+            raise ValidationError({self.file_field: [str(error)]})
+
+    def post(self, request):
+        importer = self.get_importer(request)
+        try:
+            users = importer.run()
+        except TenantImportError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        if users is None:
+            return Response({'errors': importer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'created': len(users)}, status=status.HTTP_201_CREATED)
 
 
 class UserDetailAPIView(APIView):
@@ -134,13 +191,19 @@ class UserDetailAPIView(APIView):
 class UserProfileAPIView(APIView):
     """Handles current user's profile (GET, PUT)"""
     permission_classes = [IsAuthenticated]
+    requires_user_model = True
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        return Response(cached_user_payload(request.user.pk, 'me', lambda: self.build_data(request)))
+
+    def build_data(self, request):
+        user = UserSerializer.setup_profile_loading(User.objects.all()).get(pk=request.user.pk)
+        return UserSerializer(user).data
 
     def put(self, request):
-        serializer = UserSerializer(request.user, data=request.data, partial=True)
+        # request.user may come from core.user_cache; save a fresh row, not a cached snapshot.
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UserSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -151,6 +214,7 @@ class UserProfileAPIView(APIView):
 class CreateTokenView(APIView):
     """Create a new JWT token for user"""
     serializer_class = AuthTokenSerializer
+    throttle_classes = [LoginIPRateThrottle, LoginEmailRateThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(
@@ -160,19 +224,24 @@ class CreateTokenView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
 
-        refresh = RefreshToken.for_user(user)
-
-        # Get user roles
-        user_roles = [role.name for role in user.roles.all()]
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return Response({
             'token': str(refresh.access_token),
             'user_id': user.pk,
             'email': user.email,
-            'roles': user_roles
+            'roles': refresh[ROLES_CLAIM]
 
         }, status=status.HTTP_200_OK)
 
+class LoginMetricsAPIView(APIView):
+    """Login throttling counters and password hashing CPU time"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(login_metrics())
+
+
 class UserRegistrationAPIView(APIView):
     """Public endpoint for user registration with role support"""
     def post(self, request):
@@ -181,7 +250,7 @@ class UserRegistrationAPIView(APIView):
             user = serializer.save()
 
             # Automatically create JWT tokens for new user
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
 
             return Response({
                 'message': 'User created successfully',
@@ -195,17 +264,24 @@ class UserRegistrationAPIView(APIView):
 class UsersByRoleAPIView(APIView):
     """Get users filtered by specific role"""
     permission_classes = [IsAdminUser]
+    pagination_class = StandardPagination
 
     def get(self, request, role_name):
         try:
             # Verify role exists
-            Role.objects.get(name=role_name)
+            get_role(role_name)
             
-            users = User.objects.filter(roles__name=role_name)
-            serializer = UserSerializer(users, many=True)
+            users = UserSerializer.setup_eager_loading(
+                User.objects.filter(roles__name=role_name).order_by('email', 'id')
+            )
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(users, request)
+            serializer = UserSerializer(page, many=True)
             return Response({
                 'role': role_name,
-                'count': users.count(),
+                'count': paginator.page.paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
                 'users': serializer.data
             })
         except Role.DoesNotExist: